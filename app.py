@@ -1,11 +1,21 @@
+import hashlib
 import os
-from flask import Flask, jsonify, request, send_from_directory, render_template
+from datetime import datetime
+from functools import partial, wraps
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from flask import Flask, Response, g, jsonify, request, send_from_directory, render_template
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
-from flask_caching import Cache
 from apscheduler.schedulers.background import BackgroundScheduler
 from course_fetcher import CourseFetcher
+from course_model import (COURSE_FIELDS, FORMATTED_TIMES, HEADER_FIELDS, WEEKDAYS, parse_clock_time,
+                          parse_military_time)
+from course_snapshot import EMPTY_SNAPSHOT
+from facet_index import FACETS, CourseFilters
+from refresh_scheduler import RefreshScheduler
+from response_cache import ENCODINGS, CachedResponse, ResponseCache
 from room_fetcher import RoomFetcher  # Import the new RoomFetcher class
+from schedule_builder import ScheduleBuilder
 from salary_api import SalaryData  # Import SalaryData class for salaries
 import logging
 
@@ -13,6 +23,13 @@ import logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# "Now" for room availability is campus time; fall back to the server's
+# local time where no time zone database is installed
+try:
+    CAMPUS_TIMEZONE = ZoneInfo("America/New_York")
+except ZoneInfoNotFoundError:
+    CAMPUS_TIMEZONE = None
+
 app = Flask(__name__)
 app.secret_key = os.environ.get("SESSION_SECRET", "dev-secret-key")
 
@@ -32,23 +49,142 @@ limiter = Limiter(
     storage_uri="memory://"
 )
 
-# Configure caching
-cache = Cache(app, config={'CACHE_TYPE': 'SimpleCache'})
+# Configure caching of API responses per snapshot generation
+response_cache = ResponseCache()
 
 # Initialize course fetcher
 course_fetcher = CourseFetcher()
+course_fetcher.update_listeners.append(
+    lambda param_key, snapshot: response_cache.invalidate(param_key))
 
 # Initialize room fetcher with course fetcher
 room_fetcher = RoomFetcher(course_fetcher)
 
-# Initialize scheduler
+# Initialize schedule builder with course fetcher
+schedule_builder = ScheduleBuilder(course_fetcher)
+
+# Initialize scheduler: keeps every term in use refreshed and evicts cold ones
+refresh_scheduler = RefreshScheduler(course_fetcher, room_fetcher=room_fetcher,
+                                     pinned=[("2025", "1", "NB")])
 scheduler = BackgroundScheduler()
-scheduler.add_job(func=lambda: course_fetcher.update_courses("2025", "1", "NB"), trigger="interval", minutes=15)
+scheduler.add_job(func=refresh_scheduler.tick, trigger="interval", minutes=1)
 scheduler.start()
 
 # Initialize SalaryData for salaries
 salary_data = SalaryData()
 
+# Query parameters that only select which snapshot a response is built from
+SNAPSHOT_PARAMS = ('year', 'term', 'campus')
+
+def snapshot_cached(view=None, *, multi_campus=False):
+    """
+    Serve a JSON API view from response_cache.
+
+    Responses are keyed on the endpoint, its normalized query parameters and
+    the generation of the course snapshot they are computed from, and carry
+    a strong ETag derived from the same things, so clients revalidating an
+    unchanged response get a 304 without the view running at all.
+
+    The snapshots are pinned in g.snapshots (and g.snapshot for a single
+    campus) for the view, so everything a request computes comes from the
+    same generation even if a refresh installs a new one meanwhile.
+    Campuses that failed to load are pinned as an empty catalog, so the view
+    reports the failure in its usual format without trying to load them
+    again, and that response is not cached.
+
+    Only views declared with multi_campus=True merge several campuses; the
+    others answer campus=ALL or a list of campuses with a 400 instead of
+    loading campuses they would not use.
+    """
+    if view is None:
+        return partial(snapshot_cached, multi_campus=multi_campus)
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        campuses = course_fetcher.parse_campuses(request.args.get('campus', 'NB'))
+        if len(campuses) > 1 and not multi_campus:
+            return jsonify({
+                "status": "error",
+                "message": "campus must be a single campus code for this endpoint"
+            }), 400
+        try:
+            snapshots = course_fetcher.get_snapshots(request.args.get('year', '2025'),
+                                                     request.args.get('term', '1'),
+                                                     campuses)
+        except Exception as e:
+            logger.error(f"Error loading courses: {str(e)}")
+            snapshots = dict.fromkeys(campuses)
+        failed = None in snapshots.values()
+        g.snapshots = {campus: EMPTY_SNAPSHOT if snapshot is None else snapshot
+                       for campus, snapshot in snapshots.items()}
+        if len(g.snapshots) == 1:
+            g.snapshot = next(iter(g.snapshots.values()))
+        if failed:
+            return view(*args, **kwargs)
+        snapshots = list(snapshots.values())
+
+        # Views read the first value of each parameter, and empty values
+        # behave exactly like missing ones
+        params = tuple(sorted((name, value) for name, value in request.args.items() if value))
+
+        # Parameter-free responses (the whole term's courses or rooms) are the
+        # big, hot ones; they are served precompressed when the client allows
+        negotiated = all(name in SNAPSHOT_PARAMS for name, _ in params)
+        encoding = request.accept_encodings.best_match(ENCODINGS) if negotiated else None
+        # Only the pinned snapshots count, so refreshing one term leaves the
+        # cached responses and ETags of every other term alone
+        key = (request.path, params, tuple(snapshot.generation for snapshot in snapshots))
+        etag = hashlib.blake2b(
+            repr((request.path, params,
+                  [(snapshot.param_key, snapshot.content_hash or snapshot.generation,
+                    snapshot.fetched_at)
+                   for snapshot in snapshots])).encode(),
+            digest_size=16).hexdigest()
+        # Each representation needs its own strong ETag
+        representation_etag = f"{etag}-{encoding}" if encoding else etag
+
+        if request.if_none_match.contains(representation_etag):
+            response = Response(status=304)
+            response.set_etag(representation_etag)
+            response.headers['Cache-Control'] = 'no-cache'
+            if negotiated:
+                response.vary.add('Accept-Encoding')
+            return response
+
+        entry = response_cache.get(key)
+        if entry is None:
+            response = app.make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            entry = CachedResponse(response.get_data(), etag, response.mimetype, {})
+            response_cache.put(key, tuple(snapshot.param_key for snapshot in snapshots), entry)
+
+        if encoding:
+            response = Response(response_cache.encoded_body(key, entry, encoding),
+                                mimetype=entry.mimetype)
+            response.headers['Content-Encoding'] = encoding
+        else:
+            response = Response(entry.body, mimetype=entry.mimetype)
+        if negotiated:
+            response.vary.add('Accept-Encoding')
+        response.set_etag(representation_etag)
+        # Let browsers keep the body but always revalidate it
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    return wrapper
+
+def snapshot_last_update():
+    """
+    When the course data a response is built from was fetched: the newest
+    fetched_at of the snapshots pinned for the request, or the last update
+    of any term for views that pin none
+    """
+    snapshots = g.get('snapshots')
+    if snapshots is None:
+        return course_fetcher.last_update
+    return max((snapshot.fetched_at for snapshot in snapshots.values() if snapshot.fetched_at),
+               default=None)
+
 @app.route('/')
 def select_parameters():
     return render_template('select.html')
@@ -70,19 +206,89 @@ def health_check():
 
 @app.route('/api/courses')
 @limiter.limit("100 per minute")
+@snapshot_cached(multi_campus=True)
 def get_courses():
     try:
         year = request.args.get('year', '2025')
         term = request.args.get('term', '1')
         campus = request.args.get('campus', 'NB')
         search = request.args.get('search', '')
+        limit = request.args.get('limit', type=int)
+        offset = request.args.get('offset', 0, type=int)
 
-        courses = course_fetcher.get_courses(search=search, year=year, term=term, campus=campus)
-        return jsonify({
+        if limit is not None and limit < 1:
+            return jsonify({
+                "status": "error",
+                "message": "limit must be a positive integer"
+            }), 400
+        if offset < 0:
+            return jsonify({
+                "status": "error",
+                "message": "offset must not be negative"
+            }), 400
+
+        # Field projection: "headers" skips descriptions and sections,
+        # otherwise a comma-separated list of course fields
+        fields = request.args.get('fields', '')
+        if fields == 'headers':
+            fields = HEADER_FIELDS
+        elif fields:
+            fields = [field.strip() for field in fields.split(',') if field.strip()]
+            unknown = [field for field in fields if field not in COURSE_FIELDS]
+            if unknown:
+                return jsonify({
+                    "status": "error",
+                    "message": f"Unknown fields: {', '.join(unknown)}"
+                }), 400
+        else:
+            fields = None
+
+        # Facet filters: comma-separated values per facet, any of which
+        # may match, plus an optional meeting time window
+        filter_values = {}
+        for facet in FACETS:
+            values = [value.strip() for value in request.args.get(facet, '').split(',')
+                      if value.strip()]
+            if values:
+                filter_values[facet] = tuple(values)
+        window = {}
+        for bound in ('start_after', 'end_before'):
+            value = request.args.get(bound, '')
+            if value:
+                window[bound] = parse_time(value)
+                if window[bound] is None:
+                    return jsonify({
+                        "status": "error",
+                        "message": f"{bound} must be a time like 10:00 AM or 1000"
+                    }), 400
+        filters = CourseFilters(filter_values, **window)
+        facets = request.args.get('facets', '').lower() == 'true'
+
+        campuses = course_fetcher.parse_campuses(campus)
+        result = course_fetcher.find_courses(search=search, year=year, term=term,
+                                             campuses=campuses, offset=offset, limit=limit,
+                                             snapshots=g.get('snapshots'), filters=filters,
+                                             facets=facets)
+        total = result.total
+        if len(campuses) > 1:
+            # campus=ALL or a list: one merged ranking, each course tagged
+            # with the campus it was found on
+            data = [dict(course.to_dict(fields), campus=course_campus)
+                    for course_campus, course in result.courses]
+        else:
+            data = [course.to_dict(fields) for _, course in result.courses]
+        response = {
             "status": "success",
-            "data": courses,
-            "last_update": course_fetcher.last_update
-        })
+            "data": data,
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "count": len(data),
+            "last_update": snapshot_last_update()
+        }
+        if facets:
+            response["facets"] = result.facet_counts
+        return jsonify(response)
     except Exception as e:
         logger.error(f"Error fetching courses: {str(e)}")
         return jsonify({
@@ -90,6 +296,222 @@ def get_courses():
             "message": "Failed to fetch course data"
         }), 500
 
+# Most suggestions returned by one /api/autocomplete call
+MAX_AUTOCOMPLETE_RESULTS = 20
+
+@app.route('/api/autocomplete')
+@limiter.limit("600 per minute")
+def autocomplete():
+    """API endpoint for as-you-type course suggestions (q=prefix)"""
+    try:
+        year = request.args.get('year', '2025')
+        term = request.args.get('term', '1')
+        campus = request.args.get('campus', 'NB')
+        prefix = request.args.get('q', '')
+        limit = request.args.get('limit', 10, type=int)
+
+        if limit < 1:
+            return jsonify({
+                "status": "error",
+                "message": "limit must be a positive integer"
+            }), 400
+
+        suggestions = course_fetcher.autocomplete(prefix, year=year, term=term, campus=campus,
+                                                  limit=min(limit, MAX_AUTOCOMPLETE_RESULTS))
+        return jsonify({
+            "status": "success",
+            "data": suggestions
+        })
+    except Exception as e:
+        logger.error(f"Error getting suggestions: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": "Failed to get suggestions"
+        }), 500
+
+# Most section indices resolved by one /api/sections call
+MAX_SECTION_BATCH = 200
+
+def section_to_dict(course, section):
+    """JSON shape of a section looked up by its index"""
+    return {
+        "index": section.index,
+        "status": section.status,
+        "courseString": course.course_string,
+        "title": course.title,
+        "section": section.number,
+        "instructors": list(section.instructors),
+        "meeting_times": [meeting.to_dict() for meeting in section.meeting_times]
+    }
+
+@app.route('/api/sections/<index>')
+@limiter.limit("100 per minute")
+@snapshot_cached
+def get_section(index):
+    """API endpoint to look up one section by its index number"""
+    try:
+        year = request.args.get('year', '2025')
+        term = request.args.get('term', '1')
+        campus = request.args.get('campus', 'NB')
+
+        found = course_fetcher.lookup_sections([index], year=year, term=term, campus=campus,
+                                               snapshot=g.get('snapshot'))[index]
+        if found is None:
+            return jsonify({
+                "status": "error",
+                "message": f"Section {index} not found"
+            }), 404
+
+        return jsonify({
+            "status": "success",
+            "data": section_to_dict(*found),
+            "last_update": snapshot_last_update()
+        })
+    except Exception as e:
+        logger.error(f"Error looking up section {index}: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": "Failed to look up section"
+        }), 500
+
+@app.route('/api/sections')
+@limiter.limit("50 per minute")
+@snapshot_cached
+def get_sections():
+    """API endpoint to look up many sections at once (indices=12345,12346,...)"""
+    try:
+        year = request.args.get('year', '2025')
+        term = request.args.get('term', '1')
+        campus = request.args.get('campus', 'NB')
+        indices = [index.strip() for index in request.args.get('indices', '').split(',')
+                   if index.strip()]
+
+        if not indices:
+            return jsonify({
+                "status": "error",
+                "message": "indices must be specified"
+            }), 400
+        if len(indices) > MAX_SECTION_BATCH:
+            return jsonify({
+                "status": "error",
+                "message": f"At most {MAX_SECTION_BATCH} indices can be looked up at once"
+            }), 400
+
+        found = course_fetcher.lookup_sections(indices, year=year, term=term, campus=campus,
+                                               snapshot=g.get('snapshot'))
+        return jsonify({
+            "status": "success",
+            "data": {index: section_to_dict(*match) if match else None
+                     for index, match in found.items()},
+            "missing": [index for index, match in found.items() if match is None],
+            "last_update": snapshot_last_update()
+        })
+    except Exception as e:
+        logger.error(f"Error looking up sections: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": "Failed to look up sections"
+        }), 500
+
+# Limits for one /api/schedules call
+MAX_SCHEDULE_COURSES = 10
+MAX_SCHEDULE_RESULTS = 200
+SCHEDULE_TIME_BUDGET = 0.5  # seconds
+
+def parse_time(value):
+    """Minutes after midnight of a time like 10:00 AM or 1000, or None"""
+    minute = parse_clock_time(value)
+    return minute if minute is not None else parse_military_time(value)
+
+def parse_blackouts(value):
+    """
+    Parse blackout periods like "Monday:1200-1300,Friday:3:00 PM-11:59 PM"
+    into (day, start minute, end minute) tuples, or None if malformed
+    """
+    days = {day.lower(): day for day in WEEKDAYS}
+    blackouts = []
+    for period in value.split(','):
+        if not period.strip():
+            continue
+        day, _, times = period.partition(':')
+        start, _, end = times.partition('-')
+        day = days.get(day.strip().lower())
+        start_minute, end_minute = parse_time(start.strip()), parse_time(end.strip())
+        if day is None or start_minute is None or end_minute is None:
+            return None
+        blackouts.append((day, start_minute, end_minute))
+    return blackouts
+
+@app.route('/api/schedules')
+@limiter.limit("30 per minute")
+@snapshot_cached
+def get_schedules():
+    """API endpoint for conflict-free schedules of the given courses (courses=01:198:111,...)"""
+    try:
+        year = request.args.get('year', '2025')
+        term = request.args.get('term', '1')
+        campus = request.args.get('campus', 'NB')
+        course_strings = [course.strip() for course in request.args.get('courses', '').split(',')
+                          if course.strip()]
+        # Restrict a course to some of its sections by listing their indices
+        sections = [index.strip() for index in request.args.get('sections', '').split(',')
+                    if index.strip()]
+        location = request.args.get('location', '').strip() or None
+        open_only = request.args.get('open_only', '').lower() == 'true'
+        limit = request.args.get('limit', 50, type=int)
+
+        if not course_strings:
+            return jsonify({
+                "status": "error",
+                "message": "courses must be specified"
+            }), 400
+        if len(course_strings) > MAX_SCHEDULE_COURSES:
+            return jsonify({
+                "status": "error",
+                "message": f"At most {MAX_SCHEDULE_COURSES} courses can be scheduled at once"
+            }), 400
+        if limit < 1:
+            return jsonify({
+                "status": "error",
+                "message": "limit must be a positive integer"
+            }), 400
+        blackouts = parse_blackouts(request.args.get('blackout', ''))
+        if blackouts is None:
+            return jsonify({
+                "status": "error",
+                "message": "blackout must look like Monday:1200-1300,Friday:1500-2359"
+            }), 400
+
+        result = schedule_builder.build_schedules(course_strings, year=year, term=term,
+                                                  campus=campus, section_indices=sections,
+                                                  blackouts=blackouts, location=location,
+                                                  open_only=open_only,
+                                                  max_results=min(limit, MAX_SCHEDULE_RESULTS),
+                                                  time_budget=SCHEDULE_TIME_BUDGET,
+                                                  snapshot=g.get('snapshot'))
+        if result["missing"]:
+            return jsonify({
+                "status": "error",
+                "message": f"Courses not found: {', '.join(result['missing'])}"
+            }), 404
+
+        schedules = [[section_to_dict(course, section) for course, section in schedule]
+                     for schedule in result["schedules"]]
+        return jsonify({
+            "status": "success",
+            "data": schedules,
+            "count": len(schedules),
+            "unschedulable": result["unschedulable"],
+            "complete": result["complete"],
+            "last_update": snapshot_last_update()
+        })
+    except Exception as e:
+        logger.error(f"Error building schedules: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": "Failed to build schedules"
+        }), 500
+
 @app.route('/static/<path:path>')
 def serve_static(path):
     return send_from_directory('static', path)
@@ -158,6 +580,7 @@ def room_details_page():
 
 @app.route('/api/rooms')
 @limiter.limit("50 per minute")
+@snapshot_cached
 def get_rooms():
     """API endpoint to get rooms matching a query, with optional availability filtering"""
     try:
@@ -168,9 +591,16 @@ def get_rooms():
         
         # Get availability filter parameters
         filter_available = request.args.get('filter_available', '').lower() == 'true'
-        day = request.args.get('day', '')
+        day = request.args.get('day', '')  # one day, or several like Monday,Wednesday
         start_time = request.args.get('start_time', '')
         end_time = request.args.get('end_time', '')
+        min_duration = request.args.get('min_duration', type=int)  # minutes free in a row
+        
+        if min_duration is not None and min_duration < 1:
+            return jsonify({
+                "status": "error",
+                "message": "min_duration must be a positive number of minutes"
+            }), 400
         
         # Get building type filters
         building_types = []
@@ -192,7 +622,16 @@ def get_rooms():
         if request.args.get('campus_cook_doug', '').lower() == 'true':
             campus_filters.append('Cook/Doug')
         
-        if filter_available and day and start_time and end_time:
+        filter_applied = filter_available and day and start_time and (end_time or min_duration)
+        if filter_applied:
+            days = [name.strip() for name in day.split(',') if name.strip()]
+            if not days or any(name not in WEEKDAYS for name in days):
+                return jsonify({
+                    "status": "error",
+                    "message": f"day must be one or more of {', '.join(WEEKDAYS)}, separated by commas"
+                }), 400
+            
+
             # Filter rooms by availability in time range
             logger.debug(f"Filtering for available rooms on {day} from {start_time} to {end_time}")
             rooms = room_fetcher.find_available_rooms(
@@ -202,7 +641,9 @@ def get_rooms():
                 year=year, 
                 term=term, 
                 campus=campus,
-                search=search
+                search=search,
+                min_duration=min_duration,
+                snapshot=g.get('snapshot')
             )
         else:
             # Regular room search with filters
@@ -212,17 +653,18 @@ def get_rooms():
                 term=term, 
                 campus=campus,
                 building_types=building_types if building_types else None,
-                campus_filters=campus_filters if campus_filters else None
+                campus_filters=campus_filters if campus_filters else None,
+                snapshot=g.get('snapshot')
             )
         
         return jsonify({
             "status": "success",
             "data": rooms,
             "count": len(rooms),
-            "filter_applied": filter_available and day and start_time and end_time,
+            "filter_applied": filter_applied,
             "building_types_filtered": bool(building_types),
             "campus_filtered": bool(campus_filters),
-            "last_update": course_fetcher.last_update
+            "last_update": snapshot_last_update()
         })
     except Exception as e:
         logger.error(f"Error searching rooms: {str(e)}")
@@ -231,8 +673,88 @@ def get_rooms():
             "message": "Failed to search rooms"
         }), 500
 
+@app.route('/api/rooms/free-now')
+@limiter.limit("100 per minute")
+def get_free_rooms_now():
+    """
+    API endpoint for rooms free right now (or at day/time), longest free
+    first; with building and room, whether that room is free and when it
+    next is
+    """
+    try:
+        year = request.args.get('year', '2025')
+        term = request.args.get('term', '1')
+        campus = request.args.get('campus', 'NB')
+        search = request.args.get('search', '')
+        campus_filter = request.args.get('campus_filter', '')
+        building = request.args.get('building', '')
+        room = request.args.get('room', '')
+        min_duration = request.args.get('min_duration', 0, type=int)
+        limit = request.args.get('limit', type=int)
+
+        now = datetime.now(CAMPUS_TIMEZONE)
+        day = request.args.get('day', '') or WEEKDAYS[now.weekday()]
+        time_value = request.args.get('time', '')
+        minute = parse_time(time_value) if time_value else now.hour * 60 + now.minute
+
+        if day not in WEEKDAYS:
+            return jsonify({
+                "status": "error",
+                "message": f"day must be one of {', '.join(WEEKDAYS)}"
+            }), 400
+        if minute is None:
+            return jsonify({
+                "status": "error",
+                "message": "time must be a time like 10:00 AM or 1000"
+            }), 400
+        if min_duration < 0 or (limit is not None and limit < 1):
+            return jsonify({
+                "status": "error",
+                "message": "min_duration must not be negative and limit must be positive"
+            }), 400
+        if len(course_fetcher.parse_campuses(campus)) > 1:
+            return jsonify({
+                "status": "error",
+                "message": "campus must be a single campus code for this endpoint"
+            }), 400
+
+        # Resolve the snapshot once, so the rooms and last_update come from
+        # the same data
+        g.snapshot = course_fetcher.get_snapshot(year, term, campus) or EMPTY_SNAPSHOT
+        g.snapshots = {campus: g.snapshot}
+
+        if building and room:
+            availability = room_fetcher.get_room_availability(
+                building, room, day, minute, year=year, term=term, campus=campus,
+                min_duration=min_duration, snapshot=g.snapshot)
+            return jsonify({
+                "status": "success",
+                "data": availability,
+                "last_update": snapshot_last_update()
+            })
+
+        rooms = room_fetcher.find_free_now(day, minute, year=year, term=term, campus=campus,
+                                           campus_filter=campus_filter, search=search,
+                                           min_duration=min_duration, limit=limit,
+                                           snapshot=g.snapshot)
+        return jsonify({
+            "status": "success",
+            "data": rooms,
+            "count": len(rooms),
+            "day": day,
+            "time": FORMATTED_TIMES[minute],
+            "last_update": snapshot_last_update()
+        })
+    except Exception as e:
+        logger.error(f"Error finding free rooms: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": "Failed to find free rooms"
+        }), 500
+
 @app.route('/api/room-schedule')
 @limiter.limit("30 per minute")
+@snapshot_cached
 def get_room_schedule():
     """API endpoint to get the schedule for a specific room"""
     try:
@@ -249,13 +771,14 @@ def get_room_schedule():
             }), 400
         
         room_schedule = room_fetcher.get_room_schedule(
-            building, room, year=year, term=term, campus=campus
+            building, room, year=year, term=term, campus=campus,
+            snapshot=g.get('snapshot')
         )
         
         return jsonify({
             "status": "success",
             "data": room_schedule,
-            "last_update": course_fetcher.last_update
+            "last_update": snapshot_last_update()
         })
     except Exception as e:
         logger.error(f"Error getting room schedule: {str(e)}")
@@ -265,5 +788,69 @@ def get_room_schedule():
         }), 500
 
 
+# Most rooms whose schedules one /api/room-schedules call returns
+MAX_ROOM_SCHEDULE_BATCH = 200
+
+@app.route('/api/room-schedules')
+@limiter.limit("30 per minute")
+@snapshot_cached
+def get_room_schedules():
+    """
+    API endpoint to get the schedules of many rooms at once
+    (rooms=ARC 103,HLL 114 and/or building=ARC)
+    """
+    try:
+        year = request.args.get('year', '2025')
+        term = request.args.get('term', '1')
+        campus = request.args.get('campus', 'NB')
+        building = request.args.get('building', '').strip()
+        
+        # Full room names: building code, a space, then the room number
+        rooms = []
+        for full_name in request.args.get('rooms', '').split(','):
+            room_building, _, room = full_name.strip().partition(' ')
+            if room_building and room.strip():
+                rooms.append((room_building, room.strip()))
+            elif full_name.strip():
+                return jsonify({
+                    "status": "error",
+                    "message": f"Invalid room {full_name.strip()!r}, expected e.g. ARC 103"
+                }), 400
+        
+        if not rooms and not building:
+            return jsonify({
+                "status": "error",
+                "message": "rooms or building must be specified"
+            }), 400
+        
+        schedules = room_fetcher.get_room_schedules(
+            rooms, building=building, year=year, term=term, campus=campus,
+            snapshot=g.get('snapshot')
+        )
+        if not schedules:
+            return jsonify({
+                "status": "error",
+                "message": f"No rooms found in building {building}"
+            }), 404
+        if len(schedules) > MAX_ROOM_SCHEDULE_BATCH:
+            return jsonify({
+                "status": "error",
+                "message": f"At most {MAX_ROOM_SCHEDULE_BATCH} room schedules can be returned at once"
+            }), 400
+        
+        return jsonify({
+            "status": "success",
+            "data": schedules,
+            "count": len(schedules),
+            "last_update": snapshot_last_update()
+        })
+    except Exception as e:
+        logger.error(f"Error getting room schedules: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "message": "Failed to get room schedules"
+        }), 500
+
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -0,0 +1,112 @@
+"""
+Memory held per course by a snapshot of a full NB term, before and after
+snapshots switched from nested dicts to interned Course records.
+
+"before" enriches the synthetic catalog into the dict layout snapshots
+used to hold (the legacy_* functions below are that code); "after" is
+the current CourseFetcher.enrich_course. Sizes are deep sizes of the
+whole course list with every shared object counted once, so interned
+strings are paid for a single time.
+
+    python benchmarks/memory_per_course.py
+"""
+import sys
+from datetime import datetime
+
+from synthetic_catalog import build_snapshot, catalog
+
+WEEKDAY_MAP = {"M": "Monday", "T": "Tuesday", "W": "Wednesday", "H": "Thursday",
+               "F": "Friday", "S": "Saturday", "Su": "Sunday"}
+CAMPUS_MAP = {"1": "College Ave", "2": "Busch", "3": "Livingston", "4": "Cook/Doug"}
+
+
+def legacy_convert_to_am_pm(military_time):
+    if not military_time or military_time == "N/A":
+        return "N/A"
+    try:
+        return datetime.strptime(military_time, "%H%M").strftime("%I:%M %p").lstrip("0")
+    except ValueError:
+        return "N/A"
+
+
+def legacy_format_meeting_time(meeting):
+    start_time = meeting.get("startTimeMilitary", "N/A")
+    end_time = meeting.get("endTimeMilitary", "N/A")
+    return {
+        "day": WEEKDAY_MAP.get(meeting.get("meetingDay", ""), meeting.get("meetingDay", "")),
+        "start_time": {"military": start_time, "formatted": legacy_convert_to_am_pm(start_time)},
+        "end_time": {"military": end_time, "formatted": legacy_convert_to_am_pm(end_time)},
+        "building": meeting.get("buildingCode", "N/A"),
+        "room": meeting.get("roomNumber", "N/A"),
+        "mode": meeting.get("meetingModeDesc", "N/A"),
+        "campus": CAMPUS_MAP.get(meeting.get("campusLocation", "N/A"),
+                                 meeting.get("campusLocation", "N/A")),
+    }
+
+
+def legacy_format_section(section):
+    return {
+        "number": section.get("number", ""),
+        "index": section.get("index", ""),
+        "instructors": [instr.get("name", "") for instr in section.get("instructors", [])],
+        "status": section.get("openStatusText", ""),
+        "comments": section.get("commentsText", ""),
+        "meeting_times": [legacy_format_meeting_time(meeting)
+                          for meeting in section.get("meetingTimes", [])],
+    }
+
+
+def legacy_enrich_course(course):
+    return {
+        "courseString": course.get("courseString", ""),
+        "title": course.get("title", ""),
+        "subject": course.get("subject", ""),
+        "subjectDescription": course.get("subjectDescription", ""),
+        "course_number": course.get("courseNumber", ""),
+        "description": course.get("courseDescription", ""),
+        "credits": course.get("credits", ""),
+        "creditsDescription": course.get("creditsObject", {}).get("description", ""),
+        "school": course.get("school", {}).get("description", ""),
+        "campusLocations": [loc.get("description", "")
+                            for loc in course.get("campusLocations", [])],
+        "prerequisites": course.get("preReqNotes", ""),
+        "coreRequirements": [{"code": core.get("coreCode", ""),
+                              "description": core.get("coreCodeDescription", "")}
+                             for core in course.get("coreCodes", [])],
+        "sections": [legacy_format_section(section) for section in course.get("sections", [])],
+    }
+
+
+def deep_size(obj, seen=None) -> int:
+    """Bytes held by obj and everything it references, each object counted once"""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(key, seen) + deep_size(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_size(item, seen) for item in obj)
+    else:
+        for cls in type(obj).__mro__:
+            for slot in getattr(cls, "__slots__", ()):
+                if hasattr(obj, slot):
+                    size += deep_size(getattr(obj, slot), seen)
+    return size
+
+
+def main():
+    before = [legacy_enrich_course(course) for course in catalog()]
+    _, snapshot = build_snapshot(catalog())
+    after = list(snapshot.courses)
+
+    for label, courses in (("before", before), ("after", after)):
+        total = deep_size(courses)
+        print(f"{label:>6}: {len(courses)} courses, {total / 1e6:5.1f} MB, "
+              f"{total / len(courses):6,.0f} bytes/course")
+
+
+if __name__ == "__main__":
+    main()
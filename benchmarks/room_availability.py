@@ -0,0 +1,134 @@
+"""
+Whole-campus room availability on the synthetic NB catalog (about 2,900
+rooms and 30,000 timed meetings).
+
+Single day and range: which rooms are busy, found by scanning every
+meeting of every room (how find_available_rooms worked before the
+occupancy index) against RoomOccupancy.busy_rooms. Both are checked
+against each other on random ranges first.
+
+    python benchmarks/room_availability.py
+"""
+import random
+import time
+
+from synthetic_catalog import build_snapshot, catalog
+
+from course_model import WEEKDAYS
+from room_fetcher import RoomFetcher
+from room_occupancy import RoomOccupancy, RoomSlotMatrix
+
+
+def best_ms(call, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def scan_busy_rooms(meetings_by_room, day, start_minute, end_minute):
+    """Busy rooms by comparing the range against every meeting of every room"""
+    return {room_key for room_key, meetings in meetings_by_room.items()
+            if any(meeting.day == day and meeting.start_minute is not None and
+                   meeting.end_minute is not None and
+                   start_minute < meeting.end_minute and meeting.start_minute < end_minute
+                   for _, _, meeting in meetings)}
+
+
+def brute_force_free(meetings_by_room, days, start_minute, end_minute, min_minutes=None):
+    """free_rooms computed from each room's sorted meetings, one room at a time"""
+    free = []
+    for room_meetings in meetings_by_room.values():
+        is_free = True
+        for day in dict.fromkeys(days):
+            intervals = sorted((meeting.start_minute, meeting.end_minute)
+                               for _, _, meeting in room_meetings
+                               if meeting.day == day and meeting.start_minute is not None
+                               and meeting.end_minute is not None)
+            if min_minutes is None:
+                is_free &= not any(start < end_minute and start_minute < end
+                                   for start, end in intervals)
+                continue
+            # Longest free stretch inside the range
+            longest, free_from = 0, start_minute
+            for start, end in intervals:
+                if end <= free_from:
+                    continue
+                if start >= end_minute:
+                    break
+                longest = max(longest, start - free_from)
+                free_from = max(free_from, end)
+            longest = max(longest, end_minute - free_from)
+            is_free &= longest >= min_minutes
+        free.append(is_free)
+    return free
+
+
+def per_day_intersection(room_fetcher, snapshot, days, start_time, end_time):
+    """Rooms free on every one of days, with one find_available_rooms call per day"""
+    per_day = [room_fetcher.find_available_rooms(day, start_time, end_time, snapshot=snapshot)
+               for day in days]
+    keep = set.intersection(*({(room['building'], room['room']) for room in rooms}
+                              for rooms in per_day))
+    return [(room['building'], room['room']) for room in per_day[0]
+            if (room['building'], room['room']) in keep]
+
+
+def main():
+    fetcher, snapshot = build_snapshot(catalog())
+    room_fetcher = RoomFetcher(fetcher)
+    rooms = room_fetcher._get_room_snapshot("2025", "1", "NB", snapshot)
+    meetings = rooms.meetings_by_room
+    timed = sum(1 for room_meetings in meetings.values() for _, _, meeting in room_meetings
+                if meeting.start_minute is not None)
+    print(f"{len(rooms)} rooms, {timed} timed meetings")
+
+    rng = random.Random(3)
+    for _ in range(400):
+        day = rng.choice(WEEKDAYS + ("", "monday"))
+        start, end = rng.randrange(-10, 1450), rng.randrange(-10, 1450)
+        assert scan_busy_rooms(meetings, day, start, end) == rooms.occupancy.busy_rooms(day, start, end)
+    print("busy rooms match the meeting scan on 400 random ranges")
+
+    print("\nFree rooms Monday 10:00-11:00 AM")
+    print(f"  busy rooms, meeting scan:    {best_ms(lambda: scan_busy_rooms(meetings, 'Monday', 600, 660)):7.2f} ms")
+    print(f"  busy rooms, occupancy index: {best_ms(lambda: rooms.occupancy.busy_rooms('Monday', 600, 660)):7.2f} ms")
+    print(f"  find_available_rooms:        "
+          f"{best_ms(lambda: room_fetcher.find_available_rooms('Monday', '10:00 AM', '11:00 AM', snapshot=snapshot)):7.2f} ms")
+    print(f"  occupancy index build:       {best_ms(lambda: RoomOccupancy(meetings), 3):7.2f} ms")
+
+    slots = rooms.slots
+    rng = random.Random(5)
+    for _ in range(300):
+        days = rng.sample(WEEKDAYS, rng.randint(1, 3))
+        start = rng.randrange(0, 1400, 5)
+        end = rng.randrange(start + 5, 1440, 5)
+        min_minutes = rng.choice([None, 30, 60, 90, 200])
+        assert (list(slots.free_rooms(days, start, end, min_minutes)) ==
+                brute_force_free(meetings, days, start, end, min_minutes))
+    print("\nslot matrix matches the brute force on 300 random multi-day windows")
+
+    monday_wednesday = [(room['building'], room['room']) for room in
+                        room_fetcher.find_available_rooms("Monday,Wednesday", "10:00 AM", "11:00 AM",
+                                                          snapshot=snapshot)]
+    assert monday_wednesday == per_day_intersection(room_fetcher, snapshot, ["Monday", "Wednesday"],
+                                                    "10:00 AM", "11:00 AM")
+    print(f"\nFree rooms Monday and Wednesday 10:00-11:00 AM ({len(monday_wednesday)} rooms)")
+    print(f"  one call per day, intersected: "
+          f"{best_ms(lambda: per_day_intersection(room_fetcher, snapshot, ['Monday', 'Wednesday'], '10:00 AM', '11:00 AM')):7.2f} ms")
+    print(f"  one multi-day call:            "
+          f"{best_ms(lambda: room_fetcher.find_available_rooms('Monday,Wednesday', '10:00 AM', '11:00 AM', snapshot=snapshot)):7.2f} ms")
+    print("\nfree_rooms reduction alone")
+    print(f"  Tuesday 2:00-3:20 PM:          {best_ms(lambda: slots.free_rooms(['Tuesday'], 840, 920), 50):7.2f} ms")
+    print(f"  Monday and Wednesday 10-11 AM: "
+          f"{best_ms(lambda: slots.free_rooms(['Monday', 'Wednesday'], 600, 660), 50):7.2f} ms")
+    print(f"  90 free minutes within 9-5, Monday-Thursday: "
+          f"{best_ms(lambda: slots.free_rooms(['Monday', 'Tuesday', 'Wednesday', 'Thursday'], 540, 1020, 90), 50):.2f} ms")
+    print(f"\nslot matrix build: {best_ms(lambda: RoomSlotMatrix(meetings), 3):.2f} ms, "
+          f"{slots.busy.nbytes / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
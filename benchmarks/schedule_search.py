@@ -0,0 +1,130 @@
+"""
+ScheduleBuilder on 6-8 heavily sectioned courses: 60 sections each, a
+twice-weekly lecture plus a recitation, spread over the four NB campuses,
+added to the synthetic catalog.
+
+Results on small instances are first checked against a brute force over
+every combination of sections (itertools.product), including the ranking
+by preferred location; then the full instances are timed with the
+endpoint's 0.5 s budget.
+
+    python benchmarks/schedule_search.py
+"""
+import itertools
+import random
+import time
+
+from synthetic_catalog import build_snapshot, catalog
+
+from schedule_builder import ScheduleBuilder, interval_mask, week_mask
+
+LECTURE_DAYS = [("M", "W"), ("T", "H"), ("M", "H"), ("W", "F"), ("T", "F")]
+STARTS = ["0810", "0950", "1200", "1340", "1520", "1700", "1840", "2020"]
+
+
+def _military(start: str, minutes: int) -> str:
+    end = int(start[:2]) * 60 + int(start[2:]) + minutes
+    return f"{end // 60:02d}{end % 60:02d}"
+
+
+def heavy_courses(count: int = 8, sections: int = 60, seed: int = 7):
+    rng = random.Random(seed)
+    courses = []
+    for k in range(count):
+        course_sections = []
+        for s in range(sections):
+            campus = rng.choice("1234")
+            lecture = rng.choice(STARTS)
+            meetings = [{"meetingDay": day, "startTimeMilitary": lecture,
+                         "endTimeMilitary": _military(lecture, 80), "buildingCode": "HLL",
+                         "roomNumber": "114", "meetingModeDesc": "LEC", "campusLocation": campus}
+                        for day in rng.choice(LECTURE_DAYS)]
+            recitation = rng.choice(STARTS)
+            meetings.append({"meetingDay": rng.choice("MTWHF"), "startTimeMilitary": recitation,
+                             "endTimeMilitary": _military(recitation, 55), "buildingCode": "ARC",
+                             "roomNumber": "103", "meetingModeDesc": "RECIT",
+                             "campusLocation": campus})
+            course_sections.append({"number": f"{s + 1:02d}", "index": str(90000 + k * 100 + s),
+                                    "instructors": [], "openStatusText": "OPEN" if s % 3 else "CLOSED",
+                                    "commentsText": "", "meetingTimes": meetings})
+        courses.append({"courseString": f"01:640:{150 + k}", "subject": "640",
+                        "courseNumber": str(150 + k), "title": f"HEAVY COURSE {k}",
+                        "subjectDescription": "Mathematics", "sections": course_sections})
+    return courses
+
+
+def brute_force(snapshot, course_strings, blackouts=(), open_only=False, location=None):
+    """(penalty, section indices) of every valid schedule"""
+    blackout_mask = 0
+    for day, start, end in blackouts:
+        blackout_mask |= interval_mask(day, start, end)
+    choices = []
+    for course_string in course_strings:
+        positions = snapshot.search_index.by_course_string[course_string.lower()]
+        choices.append([section for pos in positions for section in snapshot.courses[pos].sections
+                        if not (open_only and section.status != "OPEN")
+                        and not week_mask(section.meeting_times) & blackout_mask])
+    found = []
+    for combination in itertools.product(*choices):
+        used = 0
+        for section in combination:
+            mask = week_mask(section.meeting_times)
+            if mask & used:
+                break
+            used |= mask
+        else:
+            penalty = sum(any(meeting.campus.lower() != location.lower()
+                              for meeting in section.meeting_times)
+                          for section in combination) if location else 0
+            found.append((penalty, tuple(section.index for section in combination)))
+    return found
+
+
+def penalty(schedule, location):
+    if not location:
+        return 0
+    return sum(any(meeting.campus.lower() != location.lower() for meeting in section.meeting_times)
+               for _, section in schedule)
+
+
+def main():
+    heavy = heavy_courses()
+    fetcher, snapshot = build_snapshot(catalog() + heavy)
+    builder = ScheduleBuilder(fetcher)
+    names = [course["courseString"] for course in heavy]
+
+    for course_strings, options in [(names[:3], {}),
+                                    (names[2:5], {"open_only": True}),
+                                    (names[:3], {"location": "Busch"}),
+                                    (names[3:6], {"blackouts": [("Monday", 0, 720)],
+                                                  "location": "Livingston"})]:
+        expected = brute_force(snapshot, course_strings, **options)
+        every = builder.build_schedules(course_strings, max_results=10 ** 6, time_budget=60,
+                                        snapshot=snapshot, **options)
+        assert (sorted(tuple(section.index for _, section in schedule)
+                       for schedule in every["schedules"]) == sorted(s for _, s in expected))
+        best = builder.build_schedules(course_strings, max_results=25, time_budget=60,
+                                       snapshot=snapshot, **options)
+        assert ([penalty(schedule, options.get("location")) for schedule in best["schedules"]] ==
+                sorted(p for p, _ in expected)[:25])
+        print(f"matches brute force: {len(course_strings)} courses {options}, "
+              f"{len(expected)} schedules")
+
+    week = ("Monday", "Tuesday", "Wednesday", "Thursday")
+    variants = [{}, {"location": "Busch"},
+                {"open_only": True, "location": "College Ave"},
+                {"blackouts": [("Friday", 0, 1439), ("Monday", 0, 600)], "location": "Busch"},
+                {"blackouts": [(day, 480, 1300) for day in week], "location": "Busch"},
+                {"blackouts": [(day, 0, 1439) for day in ("Monday", "Wednesday")]}]
+    for count in (6, 7, 8):
+        for options in variants:
+            started = time.perf_counter()
+            result = builder.build_schedules(names[:count], max_results=50, time_budget=0.5,
+                                             snapshot=snapshot, **options)
+            elapsed = (time.perf_counter() - started) * 1000
+            print(f"{count} courses {options}: {len(result['schedules'])} schedules, "
+                  f"complete={result['complete']}, {elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Synthetic course catalog in the shape of the SOC courses.json response,
+sized like a full New Brunswick term (about 4,500 courses and 30,000 timed
+meetings in 2,900 rooms), for the benchmarks in this directory.
+
+The catalog is fully determined by its size and seed, so numbers measured
+on it can be reproduced. Run as a script to write it to a file:
+
+    python benchmarks/synthetic_catalog.py catalog.json
+"""
+import json
+import os
+import random
+import sys
+from typing import Dict, List
+
+# Make the app's modules importable from the benchmark scripts
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+WORDS = ("intro computer science data structures calculus linear algebra organic chemistry "
+         "general biology physics economics micro macro statistics writing expository history "
+         "american world politics psychology sociology anthropology philosophy ethics art music "
+         "theory design systems software engineering networks security principles analysis "
+         "methods seminar topics research laboratory advanced elementary spanish french").split()
+SUBJECTS = [(f"{code:03d}", name) for code, name in zip(range(1, 990, 6), [
+    "Computer Science", "Mathematics", "Biology", "Chemistry", "Physics", "Statistics",
+    "Economics", "History", "English", "Psychology", "Sociology", "Philosophy", "Music",
+    "Art History", "Spanish", "French", "Political Science", "Anthropology", "Engineering",
+    "Geography"] * 9)]
+SUBJECTS[0] = ("198", "Computer Science")
+SUBJECTS[1] = ("640", "Mathematics")
+SUBJECTS[2] = ("119", "Biology")
+DAYS = ["M", "T", "W", "H", "F", "S"]
+BUILDINGS = [f"B{i:02d}" for i in range(70)]
+STARTS = ["0830", "1020", "1210", "1400", "1550", "1740", "1930", "0800", "0930", "1100",
+          "1230", "1500"]
+CAMPUSES = ["1", "2", "3", "4"]
+
+
+def _meeting(rng: random.Random) -> Dict:
+    start = rng.choice(STARTS)
+    end = int(start[:2]) * 60 + int(start[2:]) + rng.choice([80, 80, 55, 180])
+    return {"meetingDay": rng.choice(DAYS), "startTimeMilitary": start,
+            "endTimeMilitary": f"{end // 60:02d}{end % 60:02d}",
+            "buildingCode": rng.choice(BUILDINGS), "roomNumber": str(rng.randint(100, 140)),
+            "meetingModeDesc": rng.choice(["LEC", "RECIT", "LAB"]),
+            "campusLocation": rng.choice(CAMPUSES), "campusName": "BUSCH",
+            "pmCode": "A", "startTime": start, "endTime": "0000"}
+
+
+def _course(rng: random.Random, subject: str, description: str, number: str) -> Dict:
+    title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 4))).upper()
+    sections = []
+    for s in range(rng.choice([1, 1, 1, 2, 2, 3, 4, 6, 10])):
+        meetings = [_meeting(rng) for _ in range(rng.choice([1, 2, 2, 3]))]
+        if rng.random() < 0.05:
+            meetings.append({"meetingDay": "", "startTimeMilitary": "", "endTimeMilitary": "",
+                             "buildingCode": "", "roomNumber": "",
+                             "meetingModeDesc": "ONLINE INSTRUCTION(INTERNET)",
+                             "campusLocation": "O", "campusName": "** INVALID **"})
+        is_open = rng.random() < 0.4
+        sections.append({"number": f"{s + 1:02d}", "index": str(rng.randint(10000, 99999)),
+                         "instructors": [{"name": f"{rng.choice(WORDS).upper()}, {rng.choice('ABCDEFG')}"}],
+                         "openStatus": is_open, "openStatusText": "OPEN" if is_open else "CLOSED",
+                         "commentsText": "", "meetingTimes": meetings, "instructorsText": ""})
+    return {"courseString": f"01:{subject}:{number}", "subject": subject, "courseNumber": number,
+            "title": title,
+            "subjectDescription": description,
+            "courseDescription": " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 30))),
+            "credits": rng.choice([1, 3, 4, None]),
+            "creditsObject": {"code": "3_0", "description": "3.0 credits"},
+            "school": {"code": "01", "description": "School of Arts and Sciences"},
+            "campusLocations": [{"code": "2", "description": "Busch"}],
+            "preReqNotes": "" if rng.random() < .6 else "(01:198:111 )",
+            "coreCodes": ([{"coreCode": rng.choice(["QQ", "QR", "WCr", "HST"]),
+                            "coreCodeDescription": "x"}] if rng.random() < .3 else []),
+            "sections": sections}
+
+
+def catalog(size: int = 4500, seed: int = 1) -> List[Dict]:
+    """
+    size raw API courses with distinct course strings, in random order, as
+    decoded from a response body (so no two courses share string objects)
+    """
+    rng = random.Random(seed)
+    courses = []
+    used = set()
+    while len(courses) < size:
+        subject, description = rng.choice(SUBJECTS)
+        number = f"{rng.randint(100, 499)}"
+        if (subject, number) in used:
+            continue
+        used.add((subject, number))
+        courses.append(_course(rng, subject, description, number))
+    rng.shuffle(courses)
+    return json.loads(json.dumps(courses))
+
+
+def build_snapshot(courses: List[Dict], param_key: str = "2025_1_NB"):
+    """A CourseSnapshot of raw API courses, built as a refresh builds one"""
+    from course_fetcher import CourseFetcher
+    from course_snapshot import CourseSnapshot
+
+    # Skip the initial load of the default term from the real API
+    load_courses = CourseFetcher.load_courses
+    CourseFetcher.load_courses = lambda self, *args, **kwargs: None
+    try:
+        fetcher = CourseFetcher(cache_dir=None)
+    finally:
+        CourseFetcher.load_courses = load_courses
+    enriched = sorted((fetcher.enrich_course(course) for course in courses),
+                      key=lambda course: course.course_string)
+    return fetcher, CourseSnapshot(param_key, enriched, "2025-01-01T00:00:00")
+
+
+if __name__ == "__main__":
+    courses = catalog()
+    body = json.dumps(courses)
+    with open(sys.argv[1] if len(sys.argv) > 1 else "catalog.json", "w") as f:
+        f.write(body)
+    print(f"{len(courses)} courses, {sum(len(c['sections']) for c in courses)} sections, "
+          f"{len(body) / 1e6:.1f} MB")
@@ -0,0 +1,72 @@
+"""
+Per-call cost of the time handling done for every meeting, before and
+after meeting times were normalized to integer minutes at ingest.
+
+- overlap test: the old _is_time_in_range parsed four "10:00 AM" labels
+  with strptime on every call; now both ranges are minutes after midnight
+  compared directly (RoomOccupancy does the same comparison on its index)
+- convert_to_am_pm: strptime/strftime before, a FORMATTED_TIMES lookup now
+
+    python benchmarks/time_comparisons.py
+"""
+import datetime
+import logging
+import timeit
+
+from memory_per_course import legacy_convert_to_am_pm
+from synthetic_catalog import REPO_ROOT  # noqa: F401 (puts the app on sys.path)
+
+from course_fetcher import CourseFetcher
+
+CALLS = 100_000
+
+
+def legacy_is_time_in_range(target_start, target_end, class_start, class_end):
+    if class_start == 'TBA' or class_end == 'TBA':
+        return False
+    try:
+        dummy_date = datetime.datetime.today().date()
+        time_format = '%I:%M %p'
+        target_start_dt = datetime.datetime.strptime(target_start, time_format).replace(
+            year=dummy_date.year, month=dummy_date.month, day=dummy_date.day)
+        target_end_dt = datetime.datetime.strptime(target_end, time_format).replace(
+            year=dummy_date.year, month=dummy_date.month, day=dummy_date.day)
+        class_start_dt = datetime.datetime.strptime(class_start, time_format).replace(
+            year=dummy_date.year, month=dummy_date.month, day=dummy_date.day)
+        class_end_dt = datetime.datetime.strptime(class_end, time_format).replace(
+            year=dummy_date.year, month=dummy_date.month, day=dummy_date.day)
+        return target_start_dt < class_end_dt and class_start_dt < target_end_dt
+    except ValueError:
+        return False
+
+
+def is_time_in_range(target_start, target_end, class_start, class_end):
+    if class_start is None or class_end is None:
+        return False
+    return target_start < class_end and class_start < target_end
+
+
+def per_call_us(call) -> float:
+    return min(timeit.repeat(call, number=CALLS, repeat=3)) / CALLS * 1e6
+
+
+def main():
+    fetcher = CourseFetcher.__new__(CourseFetcher)
+    # Invalid values are logged as warnings
+    logging.disable(logging.WARNING)
+    # Same labels for every HHMM value, and "N/A" for invalid ones
+    for value in [f"{h:02d}{m:02d}" for h in range(24) for m in range(60)] + ["2400", "ab", ""]:
+        assert fetcher.convert_to_am_pm(value) == legacy_convert_to_am_pm(value), value
+
+    before = per_call_us(lambda: legacy_is_time_in_range("10:00 AM", "11:00 AM",
+                                                         "10:20 AM", "11:40 AM"))
+    after = per_call_us(lambda: is_time_in_range(600, 660, 620, 700))
+    print(f"overlap test:     {before:6.2f} us -> {after:5.2f} us per call")
+
+    before = per_call_us(lambda: legacy_convert_to_am_pm("1020"))
+    after = per_call_us(lambda: fetcher.convert_to_am_pm("1020"))
+    print(f"convert_to_am_pm: {before:6.2f} us -> {after:5.2f} us per call")
+
+
+if __name__ == "__main__":
+    main()
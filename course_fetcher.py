@@ -1,15 +1,44 @@
+import hashlib
+import heapq
+import itertools
+import threading
+import time
 import requests
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, List, Dict
+from typing import Callable, Optional, Iterable, List, Dict, NamedTuple, Tuple
 import json
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from rapidfuzz import fuzz
+import numpy as np
+from course_model import (DAY_BITS, FORMATTED_TIMES, Course, MeetingTime, Section,
+                          intern_value, parse_military_time)
+from course_snapshot import CourseSnapshot
+from facet_index import CourseFilters
+from json_stream import REPEATED, iter_json_array
+from single_flight import SingleFlight
+from snapshot_cache import DEFAULT_CACHE_DIR, SnapshotCache
 
 logger = logging.getLogger(__name__)
 
 
+class CourseSearchResult(NamedTuple):
+    courses: List[Tuple[str, Course]]  # (campus, course)
+    total: int
+    facet_counts: Optional[Dict[str, Dict[str, int]]]
+
+
+def _digest_text(text: str) -> str:
+    """Content hash of a piece of JSON source"""
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def _digest(value) -> str:
+    """Stable content hash of a JSON-compatible value"""
+    return _digest_text(json.dumps(value, sort_keys=True, separators=(",", ":")))
+
+
 class CourseFetcher:
     # Mapping weekday codes to full names
     WEEKDAY_MAP = {
@@ -30,12 +59,62 @@ class CourseFetcher:
         "4": "Cook/Doug"
     }
 
-    def __init__(self):
+    # Campus codes searched by campus=ALL: New Brunswick, Newark, Camden
+    CAMPUSES = ("NB", "NK", "CM")
+
+    # Bytes read from the SOC API per chunk while streaming a refresh
+    STREAM_CHUNK_SIZE = 64 * 1024
+
+    # Threads used by rapidfuzz for batched fuzzy scoring (-1 = all cores)
+    SEARCH_WORKERS = -1
+
+    # Seconds a request waits for another thread's load of the same term
+    # before giving up
+    LOAD_WAIT_TIMEOUT = 60
+
+    # Common department abbreviations used in course-code searches
+    DEPT_ABBREVIATIONS = {
+        "cs": "198",  # Computer Science
+        "math": "640",  # Mathematics
+        "bio": "119",  # Biology
+        "chem": "160",  # Chemistry
+        "phys": "750",  # Physics
+        "stat": "960",  # Statistics
+        "econ": "220"   # Economics
+    }
+
+    def __init__(self, cache_dir: Optional[str] = DEFAULT_CACHE_DIR):
         self.courses_by_params = {
         }  # Store courses for different parameter combinations
         self.last_update = None
         self.base_url = "https://classes.rutgers.edu/soc/api/courses.json"
 
+        # Called with (param_key, snapshot) whenever a param_key gets a new
+        # snapshot, or (param_key, None) when it is evicted, e.g. to drop
+        # responses cached for the data it replaces
+        self.update_listeners: List[Callable[[str, Optional[CourseSnapshot]], None]] = []
+        # Called with every snapshot handed out by get_snapshot
+        self.access_listeners: List[Callable[[CourseSnapshot], None]] = []
+
+        # Per param_key bookkeeping for the refresh scheduler: the arguments
+        # it was requested with, when it was last requested and when it was
+        # last confirmed current against the API (time.monotonic() values)
+        self.term_params: Dict[str, Tuple[str, str, str]] = {}
+        self.last_access: Dict[str, float] = {}
+        self.checked_at: Dict[str, float] = {}
+
+        # Concurrent loads and refreshes of the same param_key share one call,
+        # so a burst of requests for a new term costs a single download
+        self._loads = SingleFlight()
+        self._updates = SingleFlight()
+
+        # Loads and searches several campuses at once for multi-campus queries
+        self._campus_pool = ThreadPoolExecutor(max_workers=len(self.CAMPUSES),
+                                               thread_name_prefix="campus")
+
+        # Snapshots are persisted here so restarts don't wait on the API
+        self.snapshot_cache = SnapshotCache(cache_dir) if cache_dir else None
+
         # Configure requests session with retries
         self.session = requests.Session()
         retry_strategy = Retry(
@@ -46,18 +125,23 @@ class CourseFetcher:
         adapter = HTTPAdapter(max_retries=retry_strategy)
         self.session.mount("https://", adapter)
 
-        self.update_courses()  # Initial fetch with default params
+        self.load_courses()  # Initial load with default params
 
     def convert_to_am_pm(self, military_time: str) -> str:
         """Convert military time to AM/PM format"""
         if not military_time or military_time == "N/A":
             return "N/A"
-        try:
-            return datetime.strptime(military_time,
-                                     "%H%M").strftime("%I:%M %p").lstrip("0")
-        except ValueError:
+        minute = parse_military_time(military_time)
+        if minute is None:
             logger.warning(f"Invalid military time format: {military_time}")
             return "N/A"
+        return FORMATTED_TIMES[minute]
+
+    def _format_minute(self, military_time: str, minute: Optional[int]) -> str:
+        """AM/PM label for an already parsed military time"""
+        if minute is None:
+            return self.convert_to_am_pm(military_time)
+        return FORMATTED_TIMES[minute]
 
     def format_weekday(self, day: str) -> str:
         """Convert weekday code to full name"""
@@ -67,7 +151,7 @@ class CourseFetcher:
         """Convert campus ID to campus name"""
         return self.CAMPUS_MAP.get(campus_id, campus_id)
 
-    def format_meeting_time(self, meeting: Dict) -> Dict:
+    def format_meeting_time(self, meeting: Dict) -> MeetingTime:
         """Format meeting time information with proper weekday and campus names"""
         try:
             start_time = meeting.get("startTimeMilitary", "N/A")
@@ -75,106 +159,402 @@ class CourseFetcher:
             day_code = meeting.get("meetingDay", "")
             campus_id = meeting.get("campusLocation", "N/A")
 
-            return {
-                "day": self.format_weekday(day_code),
-                "start_time": {
-                    "military": start_time,
-                    "formatted": self.convert_to_am_pm(start_time)
-                },
-                "end_time": {
-                    "military": end_time,
-                    "formatted": self.convert_to_am_pm(end_time)
-                },
-                "building": meeting.get("buildingCode", "N/A"),
-                "room": meeting.get("roomNumber", "N/A"),
-                "mode": meeting.get("meetingModeDesc", "N/A"),
-                "campus": self.format_campus(campus_id)
-            }
+            day = self.format_weekday(day_code)
+            start_minute = parse_military_time(start_time)
+            end_minute = parse_military_time(end_time)
+
+            return MeetingTime(
+                day=intern_value(day),
+                start_military=intern_value(start_time),
+                start_formatted=self._format_minute(start_time, start_minute),
+                end_military=intern_value(end_time),
+                end_formatted=self._format_minute(end_time, end_minute),
+                building=intern_value(meeting.get("buildingCode", "N/A")),
+                room=intern_value(meeting.get("roomNumber", "N/A")),
+                mode=intern_value(meeting.get("meetingModeDesc", "N/A")),
+                campus=intern_value(self.format_campus(campus_id)),
+                start_minute=start_minute,
+                end_minute=end_minute,
+                day_mask=DAY_BITS.get(day, 0)
+            )
         except Exception as e:
             logger.error(f"Error formatting meeting time: {str(e)}")
-            return {
-                "day": "N/A",
-                "start_time": {
-                    "military": "N/A",
-                    "formatted": "N/A"
-                },
-                "end_time": {
-                    "military": "N/A",
-                    "formatted": "N/A"
-                },
-                "building": "N/A",
-                "room": "N/A",
-                "mode": "N/A",
-                "campus": "N/A"
-            }
-
-    def format_section(self, section: Dict) -> Dict:
+            return MeetingTime(
+                day="N/A",
+                start_military="N/A",
+                start_formatted="N/A",
+                end_military="N/A",
+                end_formatted="N/A",
+                building="N/A",
+                room="N/A",
+                mode="N/A",
+                campus="N/A"
+            )
+
+    def format_section(self, section: Dict) -> Section:
         """Format section information with detailed meeting times"""
         try:
-            return {
-                "number":
-                section.get("number", ""),
-                "index":
-                section.get("index", ""),
-                "instructors": [
-                    instr.get("name", "")
+            return Section(
+                number=intern_value(section.get("number", "")),
+                index=section.get("index", ""),
+                instructors=tuple(
+                    intern_value(instr.get("name", ""))
                     for instr in section.get("instructors", [])
-                ],
-                "status":
-                section.get("openStatusText", ""),
-                "comments":
-                section.get("commentsText", ""),
-                "meeting_times": [
+                ),
+                status=intern_value(section.get("openStatusText", "")),
+                comments=intern_value(section.get("commentsText", "")),
+                meeting_times=tuple(
                     self.format_meeting_time(meeting)
                     for meeting in section.get("meetingTimes", [])
-                ]
-            }
+                )
+            )
         except Exception as e:
             logger.error(f"Error formatting section: {str(e)}")
-            return {
-                "number": "Error",
-                "index": "",
-                "instructors": [],
-                "status": "Error loading section",
-                "comments": "",
-                "meeting_times": []
-            }
+            return Section(
+                number="Error",
+                index="",
+                instructors=(),
+                status="Error loading section",
+                comments="",
+                meeting_times=()
+            )
+
+    def enrich_course(self, course: Dict,
+                      sections: Optional[Tuple[Section, ...]] = None) -> Course:
+        """
+        Convert a raw API course into the compact record held by snapshots.
+        Already formatted sections can be passed in to skip reformatting them.
+        """
+        if sections is None:
+            sections = tuple(
+                self.format_section(section) for section in course.get("sections", [])
+            )
+        return Course(
+            course_string=course.get("courseString", ""),
+            title=course.get("title", ""),
+            subject=intern_value(course.get("subject", "")),
+            subject_description=intern_value(course.get("subjectDescription", "")),
+            course_number=intern_value(course.get("courseNumber", "")),
+            description=course.get("courseDescription", ""),
+            credits=intern_value(course.get("credits", "")),
+            credits_description=intern_value(
+                course.get("creditsObject", {}).get("description", "")),
+            school=intern_value(course.get("school", {}).get("description", "")),
+            campus_locations=tuple(
+                intern_value(loc.get("description", ""))
+                for loc in course.get("campusLocations", [])
+            ),
+            prerequisites=course.get("preReqNotes", ""),
+            core_requirements=tuple(
+                (intern_value(core.get("coreCode", "")),
+                 intern_value(core.get("coreCodeDescription", "")))
+                for core in course.get("coreCodes", [])
+            ),
+            sections=tuple(sections)
+        )
+
+    def _section_hashes(self, course: Dict) -> Tuple[Tuple[str, str], ...]:
+        """Fingerprint each section of a raw API course as an (index, hash) pair"""
+        return tuple(
+            (str(section.get("index", "")), _digest(section))
+            for section in course.get("sections", [])
+        )
+
+    def _ingest_courses(self, records: Iterable[Tuple[Dict, str, str]],
+                        previous: Optional[CourseSnapshot] = None
+                        ) -> Tuple[List[Course], Dict[str, Tuple], List[Tuple[str, int, str]],
+                                   List[int], Dict[str, int]]:
+        """
+        Enrich raw API courses one at a time as they are decoded.
+
+        records yields (course, raw_json, separator) triples from
+        iter_json_array. With a previous snapshot, courses the stream repeats
+        from the previous response arrive as REPEATED and are taken from it
+        without being decoded. Other courses are diffed by courseString
+        (using a hash of their raw JSON) and sections by index, and only
+        entries whose source changed are re-enriched; everything else is
+        shared with the previous snapshot. Returns the enriched courses,
+        their source hashes, the response layout, the index in the courses of
+        each layout entry (-1 if it could not be enriched) and diff stats.
+        """
+        old_hashes = previous.source_hashes if previous is not None else {}
+        old_courses = ({c.course_string: c for c in previous.courses}
+                       if previous is not None else {})
+
+        enriched_courses = []
+        source_hashes = {}
+        layout = []
+        positions = []
+        stats = {"received": 0, "added": 0, "changed": 0, "removed": 0,
+                 "sections_rebuilt": 0, "repeated": 0}
+        for course, raw_json, separator in records:
+            stats["received"] += 1
+            if stats["received"] == 1:
+                # Log a sample course to verify structure
+                logger.debug(f"Sample course structure: {raw_json}")
+
+            if course is REPEATED:
+                # Same source, at the same place, as in the previous response
+                entry = len(layout)
+                layout.append(previous.source_layout[entry])
+                position = previous.source_positions[entry]
+                if position < 0:
+                    positions.append(-1)
+                    continue
+                old_course = previous.courses[position]
+                source_hashes[old_course.course_string] = old_hashes[old_course.course_string]
+                positions.append(len(enriched_courses))
+                enriched_courses.append(old_course)
+                stats["repeated"] += 1
+                continue
+
+            course_hash = _digest_text(raw_json)
+            layout.append((intern_value(separator), len(raw_json), course_hash))
+            try:
+                course_string = course.get("courseString", "")
+
+                old = old_hashes.get(course_string)
+                old_course = old_courses.get(course_string)
+                if old is not None and old_course is not None and old[0] == course_hash:
+                    source_hashes[course_string] = old
+                    positions.append(len(enriched_courses))
+                    enriched_courses.append(old_course)
+                    continue
+
+                section_hashes = self._section_hashes(course)
+                source_hashes[course_string] = (course_hash, section_hashes)
+
+                # Reuse every section whose index and content are unchanged
+                reusable = {}
+                if old is not None and old_course is not None:
+                    reusable = dict(zip(old[1], old_course.sections))
+                    stats["changed"] += 1
+                else:
+                    stats["added"] += 1
+
+                sections = []
+                for section, key in zip(course.get("sections", []), section_hashes):
+                    formatted = reusable.get(key)
+                    if formatted is None:
+                        formatted = self.format_section(section)
+                        stats["sections_rebuilt"] += 1
+                    sections.append(formatted)
+
+                enriched = self.enrich_course(course, sections=sections)
+                positions.append(len(enriched_courses))
+                enriched_courses.append(enriched)
+            except Exception as e:
+                logger.error(f"Error enriching course data: {str(e)}")
+                positions.append(-1)
+                continue
+
+        stats["removed"] = len(old_courses.keys() - source_hashes.keys())
+        return enriched_courses, source_hashes, layout, positions, stats
+
+    def load_courses(self, year="2025", term="1", campus="NB") -> None:
+        """
+        Make courses for these parameters available as quickly as possible.
+
+        A snapshot saved by a previous run is installed straight from disk and
+        revalidated against the API in the background; without one, the
+        courses are fetched synchronously.
+        """
+        param_key = f"{year}_{term}_{campus}"
+        snapshot = self.snapshot_cache.load(param_key) if self.snapshot_cache else None
+
+        if snapshot is None:
+            self.update_courses(year, term, campus)
+            return
+
+        self._install_snapshot(snapshot)
+        if self.last_update is None:
+            self.last_update = snapshot.fetched_at
+
+        threading.Thread(target=self.update_courses,
+                         args=(year, term, campus),
+                         name=f"revalidate-{param_key}",
+                         daemon=True).start()
+
+    def _install_snapshot(self, snapshot: CourseSnapshot) -> None:
+        """Make snapshot the current data for its param_key and notify listeners"""
+        self.courses_by_params[snapshot.param_key] = snapshot
+        self._notify_update(snapshot.param_key, snapshot)
+
+    def _notify_update(self, param_key: str, snapshot: Optional[CourseSnapshot]) -> None:
+        for listener in self.update_listeners:
+            try:
+                listener(param_key, snapshot)
+            except Exception as e:
+                logger.error(f"Snapshot update listener failed: {str(e)}")
+
+    def evict_courses(self, param_key: str) -> None:
+        """Forget the courses for param_key; they are reloaded on next use"""
+        if self.courses_by_params.pop(param_key, None) is None:
+            return
+        self.term_params.pop(param_key, None)
+        self.last_access.pop(param_key, None)
+        self.checked_at.pop(param_key, None)
+        logger.info(f"Evicted courses for {param_key}")
+        self._notify_update(param_key, None)
+
+    def get_snapshot(self, year="2025", term="1", campus="NB") -> Optional[CourseSnapshot]:
+        """Current snapshot for these parameters, loading it if necessary"""
+        param_key = f"{year}_{term}_{campus}"
+        if param_key not in self.courses_by_params:
+            self._loads.do(param_key,
+                           lambda: self._load_if_missing(year, term, campus),
+                           timeout=self.LOAD_WAIT_TIMEOUT)
+
+        snapshot = self.courses_by_params.get(param_key)
+        if snapshot is not None:
+            # Only terms that loaded are tracked, so requests for terms that
+            # don't exist leave nothing behind
+            self.term_params[param_key] = (year, term, campus)
+            self.last_access[param_key] = time.monotonic()
+            for listener in self.access_listeners:
+                try:
+                    listener(snapshot)
+                except Exception as e:
+                    logger.error(f"Snapshot access listener failed: {str(e)}")
+        return snapshot
+
+    def parse_campuses(self, campus: str) -> List[str]:
+        """
+        Campus codes selected by a campus parameter: "ALL" for every campus,
+        a comma-separated list like "NB,NK", or a single code.
+        """
+        if campus.upper() == "ALL":
+            return list(self.CAMPUSES)
+        campuses = [code.strip() for code in campus.split(",") if code.strip()]
+        return list(dict.fromkeys(campuses)) or [campus]
+
+    def get_snapshots(self, year: str, term: str,
+                      campuses: List[str]) -> Dict[str, Optional[CourseSnapshot]]:
+        """
+        Current snapshots for several campuses, loaded concurrently so a cold
+        start takes about as long as the slowest campus. Campuses that fail
+        to load map to None.
+        """
+        if len(campuses) == 1:
+            return {campuses[0]: self.get_snapshot(year, term, campuses[0])}
+
+        def load(campus):
+            try:
+                return self.get_snapshot(year, term, campus)
+            except Exception as e:
+                logger.error(f"Failed to load courses for campus {campus}: {str(e)}")
+                return None
+
+        return dict(zip(campuses, self._campus_pool.map(load, campuses)))
+
+    def _load_if_missing(self, year: str, term: str, campus: str) -> None:
+        # A load that finished just before this one was started already did the work
+        if f"{year}_{term}_{campus}" not in self.courses_by_params:
+            self.load_courses(year, term, campus)
 
     def update_courses(self, year="2025", term="1", campus="NB") -> None:
         """Fetch fresh course data from Rutgers API"""
-        # Define param_key before the try block to make it available in exception handlers
+        # Refreshes already running for this term are joined instead of repeated
         param_key = f"{year}_{term}_{campus}"
-        
+        self._updates.do(param_key,
+                         lambda: self._fetch_courses(year, term, campus, param_key),
+                         timeout=self.LOAD_WAIT_TIMEOUT)
+
+    def _fetch_courses(self, year: str, term: str, campus: str, param_key: str) -> None:
         try:
             params = {"year": year, "term": term, "campus": campus}
             logger.info(f"Fetching courses with parameters: {params}")
 
-            response = self.session.get(self.base_url,
-                                        params=params,
-                                        timeout=30)
-            response.raise_for_status()
+            # Revalidate against what we already have so an unchanged
+            # catalog costs a 304 instead of a full download
+            previous = self.courses_by_params.get(param_key)
+            headers = {}
+            if previous is not None and previous.etag:
+                headers["If-None-Match"] = previous.etag
+            if previous is not None and previous.last_modified:
+                headers["If-Modified-Since"] = previous.last_modified
+
+            started = time.perf_counter()
+            body_hash = hashlib.sha256()
+            received_bytes = 0
+
+            with self.session.get(self.base_url,
+                                  params=params,
+                                  headers=headers,
+                                  timeout=30,
+                                  stream=True) as response:
+                if response.status_code == 304 and previous is not None:
+                    self.checked_at[param_key] = time.monotonic()
+                    logger.info(
+                        f"Courses for {param_key} not modified (0 bytes transferred)")
+                    return
+                response.raise_for_status()
+
+                def chunks():
+                    nonlocal received_bytes
+                    for chunk in response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE):
+                        body_hash.update(chunk)
+                        received_bytes += len(chunk)
+                        yield chunk
+
+                # Decode and enrich course by course, so neither the raw body
+                # nor the full raw course list is ever held in memory. The
+                # unchanged body hash is only known at the end, but courses
+                # repeating the previous response byte for byte are hashed
+                # instead of decoded, so an unchanged catalog served without
+                # validators costs little more than reading it
+                known = previous.source_layout if previous is not None else ()
+                courses, source_hashes, layout, positions, stats = self._ingest_courses(
+                    iter_json_array(chunks(), known=known, digest=_digest_text), previous)
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+
+            response_size = received_bytes / 1024  # Size in KB
+            content_hash = body_hash.hexdigest()
+            if previous is not None and previous.content_hash == content_hash:
+                self.checked_at[param_key] = time.monotonic()
+                logger.info(
+                    f"Courses for {param_key} unchanged "
+                    f"({response_size:.2f} KB transferred, body hash matches)")
+                return
 
-            courses = response.json()
-            response_size = len(response.content) / 1024  # Size in KB
             logger.info(
-                f"Retrieved {len(courses)} courses from API (Response size: {response_size:.2f} KB)"
+                f"Retrieved {stats['received']} courses from API (Response size: {response_size:.2f} KB)"
             )
 
             if not courses:
                 logger.warning("Received empty course list from API")
                 return
 
-            # Log a sample course to verify structure
-            if courses:
-                logger.debug(
-                    f"Sample course structure: {json.dumps(courses[0], indent=2)}"
-                )
-
-            self.courses_by_params[param_key] = sorted(
-                courses, key=lambda c: c.get("courseString", ""))
-            self.last_update = datetime.now().isoformat()
+            # Sort by course string, keeping track of where each course went
+            order = sorted(range(len(courses)), key=lambda i: courses[i].course_string)
+            sorted_positions = [0] * len(courses)
+            for new_position, old_position in enumerate(order):
+                sorted_positions[old_position] = new_position
+            courses = [courses[i] for i in order]
+            positions = [sorted_positions[p] if p >= 0 else -1 for p in positions]
+            fetched_at = datetime.now().isoformat()
+            snapshot = CourseSnapshot(param_key, courses, fetched_at,
+                                      content_hash=content_hash,
+                                      etag=etag,
+                                      last_modified=last_modified,
+                                      source_hashes=source_hashes,
+                                      source_layout=layout,
+                                      source_positions=positions)
+            self._install_snapshot(snapshot)
+            self.checked_at[param_key] = time.monotonic()
+            self.last_update = fetched_at
+            logger.info(
+                f"Refreshed {param_key} in {(time.perf_counter() - started) * 1000:.1f} ms: "
+                f"{response_size:.2f} KB transferred, {stats['added']} courses added, "
+                f"{stats['changed']} changed, {stats['removed']} removed, "
+                f"{stats['sections_rebuilt']} sections re-enriched, "
+                f"{stats['repeated']} courses repeated unchanged")
             logger.info(f"Successfully updated courses at {self.last_update}")
 
+            if self.snapshot_cache:
+                self.snapshot_cache.save(snapshot)
+
         except requests.exceptions.Timeout:
             logger.error("Timeout while fetching courses from API")
             if param_key not in self.courses_by_params:
@@ -192,131 +572,158 @@ class CourseFetcher:
             if param_key not in self.courses_by_params:
                 raise
 
-    def fuzzy_search_courses(self,
-                             courses: List[Dict],
-                             query: str,
-                             threshold: int = 70) -> List[Dict]:
-        """Filter and rank courses using fuzzy matching on key fields."""
-        results = []
-        query = query.lower().strip()
-        
-        # Check if query matches common patterns for course codes
-        is_specific_course_query = False
-        subject_part = None
-        number_part = None
-        
-        # Pattern matching for queries like "cs 111", "198:111", "computer science 111"
-        # Common department abbreviations
-        dept_abbrevs = {
-            "cs": "198",  # Computer Science
-            "math": "640",  # Mathematics
-            "bio": "119",  # Biology
-            "chem": "160",  # Chemistry
-            "phys": "750",  # Physics
-            "stat": "960",  # Statistics
-            "econ": "220"   # Economics
-        }
-        
+    def _parse_course_query(self, query: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Recognize course-code queries like "cs 111", "198:111" or "111".
+        Returns (subject_part, number_part); number_part is None for free text.
+        """
         # Try to parse common query formats
         query_parts = query.split()
         if len(query_parts) == 2:
             # Format like "cs 111" or "math 152"
             potential_dept, potential_number = query_parts
             if potential_number.isdigit():
-                is_specific_course_query = True
-                subject_part = dept_abbrevs.get(potential_dept, potential_dept)
-                number_part = potential_number
+                return (self.DEPT_ABBREVIATIONS.get(potential_dept, potential_dept),
+                        potential_number)
         elif ":" in query:
             # Format like "198:111"
             parts = query.split(":")
             if len(parts) == 2 and parts[1].isdigit():
-                is_specific_course_query = True
-                subject_part = parts[0]
-                number_part = parts[1]
+                return parts[0], parts[1]
         elif query.isdigit():
             # Just a course number like "111"
-            is_specific_course_query = True
-            number_part = query
-        
-        # Group courses by their course_string for consistent matching
-        course_groups = {}
+            return None, query
+        return None, None
+
+    def fuzzy_search_courses(self,
+                             snapshot: CourseSnapshot,
+                             query: str,
+                             threshold: int = 70,
+                             limit: Optional[int] = None) -> List[Course]:
+        """
+        Filter and rank courses using fuzzy matching on key fields.
+        If limit is given, only the best `limit` courses are ranked and returned.
+        """
+        return [course for _, course in self._rank_courses(snapshot, query, threshold, limit)[0]]
+
+    def _rank_courses(self,
+                      snapshot: CourseSnapshot,
+                      query: str,
+                      threshold: int = 70,
+                      limit: Optional[int] = None,
+                      allowed: Optional[np.ndarray] = None
+                      ) -> Tuple[List[Tuple[float, Course]], int, np.ndarray]:
+        """
+        Implementation of fuzzy_search_courses. Returns the ranked courses
+        with their scores, the total number of matching courses (including
+        those cut off by limit) and a boolean mask of all matching positions.
+        If allowed is given, only courses at positions where it is True
+        can match.
+        """
+        index = snapshot.search_index
+        fuzzy_matches = None
+        results = []
+        query = query.lower().strip()
+
+        subject_part, number_part = self._parse_course_query(query)
+        is_specific_course_query = number_part is not None
+
         exact_matches = []
         high_relevance_matches = []
-        
-        # Process all courses
-        for course in courses:
-            course_string = course.get("courseString", "").lower()
-            subject = course.get("subject", "").lower()
-            course_number = course.get("courseNumber", "").lower()
-            title = course.get("title", "").lower()
-            subject_description = course.get("subjectDescription", "").lower()
-            
-            # Store courses by their courseString for grouping
-            if course_string not in course_groups:
-                course_groups[course_string] = []
-            course_groups[course_string].append(course)
-            
-            # Special handling for CS (Computer Science) department
-            # Common mistake: "cs" searches matching many unrelated courses
-            if query == "cs" and subject != "198":
-                continue
-                
-            # Handle specific course query patterns
-            if is_specific_course_query:
+        code_positions = index.code_positions(query)
+        number_or_subject_positions = index.number_or_subject_positions(query)
+
+        if is_specific_course_query:
+            # Only courses sharing the queried number (or matching the whole
+            # query exactly) can score, so look them up instead of scanning
+            candidates = set(index.by_number.get(number_part, ()))
+            candidates.update(code_positions)
+            candidates.update(number_or_subject_positions)
+
+            for pos in sorted(candidates):
+                if allowed is not None and not allowed[pos]:
+                    continue
+                course_string = index.course_strings[pos]
+                subject = index.subjects[pos]
+                course_number = index.course_numbers[pos]
+
                 # Perfect match on subject and course number
-                if (subject_part and number_part and 
-                    subject == subject_part and course_number == number_part):
+                if (subject_part and subject == subject_part and
+                        course_number == number_part):
                     exact_matches.append((100, course_string))
-                    continue
-                    
+
                 # Match on just the course number if that's all we have
-                elif (not subject_part and number_part and
-                     course_number == number_part):
+                elif not subject_part and course_number == number_part:
                     exact_matches.append((95, course_string))
-                    continue
-                    
+
                 # For dept abbreviation matches like "cs" -> "Computer Science"
-                elif (subject_part in dept_abbrevs.keys() and 
-                      number_part and 
+                elif (subject_part in self.DEPT_ABBREVIATIONS and
                       subject == "198" and  # CS department code
                       course_number == number_part):
                     exact_matches.append((98, course_string))
-                    continue
-                
+
                 # For matches on subject description like "computer science"
-                elif (subject_part and number_part and 
-                      subject_part in subject_description and 
+                elif (subject_part and
+                      subject_part in index.subject_descriptions[pos] and
                       course_number == number_part):
                     high_relevance_matches.append((90, course_string))
+
+                # Case 1: Exact match on course code
+                elif pos in code_positions:
+                    exact_matches.append((100, course_string))
+
+                # Case 2: Exact match on just course number or subject
+                elif pos in number_or_subject_positions:
+                    high_relevance_matches.append((85, course_string))
+        else:
+            # Special handling for CS (Computer Science) department
+            # Common mistake: "cs" searches matching many unrelated courses
+            if query == "cs":
+                positions = index.by_subject.get("198", ())
+            else:
+                positions = range(len(index))
+
+            # Case 1 and 2: Exact match on course code, or on just the course
+            # number or subject. Everything else is scored fuzzily.
+            exact_positions = set()
+            for pos in sorted(code_positions | number_or_subject_positions):
+                if query == "cs" and index.subjects[pos] != "198":
                     continue
-            
-            # Case 1: Exact match on course code
-            if query == course_string or query == f"{subject}:{course_number}":
-                exact_matches.append((100, course_string))
-                continue
-            
-            # Case 2: Exact match on just course number or subject
-            if query == course_number or query == subject:
-                high_relevance_matches.append((85, course_string))
-                continue
-                
-            # Skip fuzzy matching if we're doing a specific course search
-            # This prevents unrelated courses from showing up
-            if is_specific_course_query:
-                continue
-            
-            # Case 3: Fuzzy matching for general searches
-            score_course_string = fuzz.token_set_ratio(query, course_string)
-            score_title = fuzz.token_set_ratio(query, title)
-            score_subject = fuzz.token_set_ratio(query, subject)
-            score_course_number = fuzz.token_set_ratio(query, course_number)
-            score_subject_desc = fuzz.token_set_ratio(query, subject_description)
-
-            max_score = max(score_course_string, score_title, score_subject,
-                            score_course_number, score_subject_desc)
-                            
-            if max_score >= threshold:
-                results.append((max_score, course_string))
+                if allowed is not None and not allowed[pos]:
+                    continue
+                if pos in code_positions:
+                    exact_matches.append((100, index.course_strings[pos]))
+                    exact_positions.add(pos)
+                elif pos in number_or_subject_positions:
+                    high_relevance_matches.append((85, index.course_strings[pos]))
+                    exact_positions.add(pos)
+
+            # Case 3: Fuzzy matching for general searches, scored against the
+            # whole catalog in one batched call
+            scores = index.fuzzy_scores(query, threshold, workers=self.SEARCH_WORKERS)
+            if query == "cs":
+                eligible = np.zeros(len(scores), dtype=bool)
+                eligible[list(positions)] = True
+            else:
+                eligible = np.ones(len(scores), dtype=bool)
+            eligible[list(exact_positions)] = False
+            if allowed is not None:
+                eligible &= allowed
+
+            candidates = np.flatnonzero(eligible & (scores >= threshold))
+            if (limit is not None and len(candidates) > limit and
+                    not index.has_duplicate_course_strings):
+                # Keep only the fuzzy matches that can still make the top
+                # `limit`; ties on the cutoff score are all kept so the final
+                # order matches a full sort
+                fuzzy_matches = eligible & (scores >= threshold)
+                fuzzy_matches[list(exact_positions)] = True
+                candidate_scores = scores[candidates]
+                cutoff = np.partition(candidate_scores, -limit)[-limit]
+                candidates = candidates[candidate_scores >= cutoff]
+
+            course_strings = index.course_strings
+            results = [(float(scores[pos]), course_strings[pos]) for pos in candidates]
 
         # Create a unique set of course strings that matched
         unique_results = {}
@@ -336,85 +743,211 @@ class CourseFetcher:
                 if course_string not in unique_results or score > unique_results[course_string]:
                     unique_results[course_string] = score
         
-        # Convert back to list and sort by score
-        sorted_results = sorted([(score, cs) for cs, score in unique_results.items()], 
-                               key=lambda x: x[0], reverse=True)
+        # Convert back to list and sort by score. When only the first
+        # `limit` courses are wanted, a partial sort picks the top entries
+        # (ties keep insertion order, exactly like the full sort)
+        ranked = [(score, cs) for cs, score in unique_results.items()]
+        if limit is not None and limit < len(ranked):
+            sorted_results = heapq.nsmallest(
+                limit, ranked, key=lambda x: -x[0])
+        else:
+            sorted_results = sorted(ranked, key=lambda x: x[0], reverse=True)
         
+        def positions_of(course_string):
+            positions = index.by_course_string.get(course_string, ())
+            if allowed is None:
+                return positions
+            return [pos for pos in positions if allowed[pos]]
+
         # Get all courses for each matched course string
         matched_courses = []
-        for _, course_string in sorted_results:
-            matched_courses.extend(course_groups.get(course_string, []))
+        for score, course_string in sorted_results:
+            matched_courses.extend(
+                (score, snapshot.courses[pos]) for pos in positions_of(course_string))
+        if limit is not None:
+            del matched_courses[limit:]
+
+        if fuzzy_matches is not None:
+            # Pruning only happens without duplicate course strings, so every
+            # matched course string is exactly one course
+            matches = fuzzy_matches
+        else:
+            matches = np.zeros(len(index), dtype=bool)
+            for course_string in unique_results:
+                matches[list(positions_of(course_string))] = True
+        total = int(matches.sum())
             
-        logger.info(f"Search for '{query}' found {len(matched_courses)} courses from {len(unique_results)} unique course strings")
-        return matched_courses
+        logger.info(f"Search for '{query}' found {total} courses from {len(unique_results)} unique course strings")
+        return matched_courses, total, matches
+
+    def autocomplete(self,
+                     prefix: str,
+                     year="2025",
+                     term="1",
+                     campus="NB",
+                     limit: int = 10,
+                     snapshot: Optional[CourseSnapshot] = None) -> List[Dict]:
+        """
+        As-you-type suggestions for course strings, codes, titles, subjects
+        and instructors starting with prefix, from the snapshot's prefix index.
+        """
+        if snapshot is None:
+            snapshot = self.get_snapshot(year, term, campus)
+        if not snapshot:
+            return []
+        return [{"type": kind, "value": value, "courseString": course_string}
+                for kind, value, course_string in snapshot.autocomplete_index.complete(prefix, limit)]
+
+    def lookup_sections(self,
+                        indices: Iterable[str],
+                        year="2025",
+                        term="1",
+                        campus="NB",
+                        snapshot: Optional[CourseSnapshot] = None
+                        ) -> Dict[str, Optional[Tuple[Course, Section]]]:
+        """
+        Resolve section index numbers to (course, section), or None for
+        indices that are not offered in this term. Each lookup is a single
+        hash map probe.
+        """
+        if snapshot is None:
+            snapshot = self.get_snapshot(year, term, campus)
+        sections = snapshot.sections_by_index if snapshot else {}
+        return {str(index): sections.get(str(index)) for index in indices}
+
+    def find_courses(self,
+                     search: Optional[str] = None,
+                     year="2025",
+                     term="1",
+                     campuses: Iterable[str] = ("NB",),
+                     offset: int = 0,
+                     limit: Optional[int] = None,
+                     snapshots: Optional[Dict[str, Optional[CourseSnapshot]]] = None,
+                     filters: Optional[CourseFilters] = None,
+                     facets: bool = False) -> CourseSearchResult:
+        """
+        Search one or more campuses. Returns one page of (campus, course)
+        pairs, the total number of matches on all campuses and, if facets is
+        set, facet value counts over all matches.
+
+        filters narrows the courses through the snapshots' facet bitmaps
+        before the text search ranks them. Each campus is ranked in parallel,
+        only as deep as the requested page reaches, and the per-campus
+        rankings are merged by score (ties go to the campus listed first).
+        Without a search, campuses are listed one after the other.
+        """
+        campuses = list(campuses)
+        try:
+            if snapshots is None:
+                snapshots = self.get_snapshots(year, term, campuses)
+            loaded = [(campus, snapshots[campus]) for campus in campuses
+                      if snapshots.get(campus)]
+            if not loaded:
+                logger.warning(
+                    f"No courses available for parameters: year={year}, term={term}, "
+                    f"campus={','.join(campuses)}")
+                return CourseSearchResult([], 0, {} if facets else None)
+
+            end = offset + limit if limit is not None else None
+            search_one = lambda item: self._search_snapshot(item[1], search, end, filters)
+            if len(loaded) == 1:
+                searches = [search_one(loaded[0])]
+            else:
+                searches = list(self._campus_pool.map(search_one, loaded))
+
+            total = sum(campus_total for _, campus_total, _ in searches)
+            streams = [[(score, campus, course) for score, course in ranked]
+                       for (campus, _), (ranked, _, _) in zip(loaded, searches)]
+            merged = heapq.merge(*streams, key=lambda entry: -entry[0])
+            page = [(campus, course)
+                    for _, campus, course in itertools.islice(merged, offset, end)]
+
+            facet_counts = None
+            if facets:
+                facet_counts = {}
+                for (_, snapshot), (_, _, matches) in zip(loaded, searches):
+                    facet_index = snapshot.facet_index
+                    bits = facet_index.all_bits if matches is None else facet_index.to_bits(matches)
+                    for facet, counts in facet_index.counts(bits).items():
+                        merged_counts = facet_counts.setdefault(facet, {})
+                        for value, count in counts.items():
+                            merged_counts[value] = merged_counts.get(value, 0) + count
+
+            logger.info(
+                f"Returning {len(page)} of {total} courses on {', '.join(campuses)} "
+                f"for search: '{search}'")
+            return CourseSearchResult(page, total, facet_counts)
+        except Exception as e:
+            logger.error(f"Error getting courses: {str(e)}")
+            return CourseSearchResult([], 0, {} if facets else None)
+
+    def _search_snapshot(self,
+                         snapshot: CourseSnapshot,
+                         search: Optional[str],
+                         end: Optional[int],
+                         filters: Optional[CourseFilters]
+                         ) -> Tuple[List[Tuple[float, Course]], int, Optional[np.ndarray]]:
+        """
+        The first `end` matches of one snapshot with their scores, the total
+        number of matches and a mask of all matching positions (None when
+        every course matches).
+        """
+        allowed = None
+        if filters:
+            facet_index = snapshot.facet_index
+            allowed = facet_index.to_mask(facet_index.match(filters))
+
+        if search:
+            # Use fuzzy search to filter courses; only the courses up to
+            # the end of the requested page need to be ranked
+            return self._rank_courses(snapshot, search, limit=end, allowed=allowed)
+
+        if allowed is None:
+            return [(0.0, course) for course in snapshot.courses[:end]], len(snapshot), None
+        positions = np.flatnonzero(allowed)
+        return ([(0.0, snapshot.courses[pos]) for pos in positions[:end]],
+                len(positions), allowed)
 
     def get_courses(self,
                     search: Optional[str] = None,
                     year="2025",
                     term="1",
-                    campus="NB") -> List[Dict]:
-        """Get filtered course data with enriched information and fuzzy search."""
+                    campus="NB",
+                    limit: Optional[int] = None,
+                    snapshot: Optional[CourseSnapshot] = None) -> List[Course]:
+        """
+        Get filtered course data with enriched information and fuzzy search.
+        If limit is given, at most that many of the best matches are returned.
+
+        Returns the snapshot's Course records; call to_dict() on them to get
+        the JSON shape served by the API.
+        """
+        return self.search_courses(search, year, term, campus, limit=limit,
+                                   snapshot=snapshot)[0]
+
+    def search_courses(self,
+                       search: Optional[str] = None,
+                       year="2025",
+                       term="1",
+                       campus="NB",
+                       offset: int = 0,
+                       limit: Optional[int] = None,
+                       snapshot: Optional[CourseSnapshot] = None,
+                       filters: Optional[CourseFilters] = None) -> Tuple[List[Course], int]:
+        """
+        Get one page of filtered courses, starting at offset and holding at
+        most limit courses, together with the total number of matches.
+        Searches the given snapshot if one is passed (e.g. the one a request
+        pinned), otherwise the current one for year/term/campus.
+        """
         try:
-            param_key = f"{year}_{term}_{campus}"
-
-            # Update courses for these parameters if not already cached
-            if param_key not in self.courses_by_params:
-                self.update_courses(year, term, campus)
-
-            if not self.courses_by_params.get(param_key):
-                logger.warning(
-                    f"No courses available for parameters: year={year}, term={term}, campus={campus}"
-                )
-                return []
-
-            filtered_courses = self.courses_by_params[param_key]
-
-            if search:
-                # Use fuzzy search to filter courses
-                filtered_courses = self.fuzzy_search_courses(
-                    filtered_courses, search)
-
-            # Enrich course data with detailed information
-            enriched_courses = []
-            for course in filtered_courses:
-                try:
-                    enriched_course = {
-                        "courseString": course.get("courseString", ""),
-                        "title": course.get("title", ""),
-                        "subject": course.get("subject", ""),
-                        "subjectDescription": course.get("subjectDescription", ""),
-                        "course_number": course.get("courseNumber", ""),
-                        "description": course.get("courseDescription", ""),
-                        "credits": course.get("credits", ""),
-                        "creditsDescription": course.get("creditsObject", {}).get("description", ""),
-                        "school": course.get("school", {}).get("description", ""),
-                        "campusLocations": [
-                            loc.get("description", "") for loc in course.get("campusLocations", [])
-                        ],
-                        "prerequisites": course.get("preReqNotes", ""),
-                        "coreRequirements": [
-                            {
-                                "code": core.get("coreCode", ""),
-                                "description": core.get("coreCodeDescription", "")
-                            }
-                            for core in course.get("coreCodes", [])
-                        ],
-                        "sections": [
-                            self.format_section(section) for section in course.get("sections", [])
-                        ]
-                    }
-                    
-                    enriched_courses.append(enriched_course)
-
-                except Exception as e:
-                    logger.error(f"Error enriching course data: {str(e)}")
-                    continue
-
-
-            logger.info(
-                f"Returning {len(enriched_courses)} enriched courses for search: '{search}'"
-            )
-            return enriched_courses
+            # Load courses for these parameters if not already cached
+            if snapshot is None:
+                snapshot = self.get_snapshot(year, term, campus)
         except Exception as e:
             logger.error(f"Error getting courses: {str(e)}")
-            return []
+            return [], 0
+
+        result = self.find_courses(search, year, term, [campus], offset, limit,
+                                   snapshots={campus: snapshot}, filters=filters)
+        return [course for _, course in result.courses], result.total
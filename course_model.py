@@ -0,0 +1,188 @@
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Collection, Dict, Optional, Tuple
+
+# Weekday names as used in meeting times, in calendar order
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+# One bit per weekday, so sets of meeting days can be combined and tested
+# with integer operations
+DAY_BITS = {day: 1 << i for i, day in enumerate(WEEKDAYS)}
+
+MINUTES_PER_DAY = 24 * 60
+
+# "9:05 AM"-style label for every minute of the day
+FORMATTED_TIMES = tuple(
+    f"{(minute // 60) % 12 or 12}:{minute % 60:02d} {'AM' if minute < 720 else 'PM'}"
+    for minute in range(MINUTES_PER_DAY)
+)
+
+
+def intern_value(value):
+    """Intern strings so repeated categorical values share one object"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def parse_military_time(military_time: str) -> Optional[int]:
+    """Convert an "HHMM" time to minutes after midnight, or None if invalid"""
+    if not military_time or military_time == "N/A":
+        return None
+    if len(military_time) == 4 and military_time.isdigit():
+        hours, minutes = int(military_time[:2]), int(military_time[2:])
+        return hours * 60 + minutes if hours < 24 and minutes < 60 else None
+    try:
+        parsed = datetime.strptime(military_time, "%H%M")
+    except ValueError:
+        return None
+    return parsed.hour * 60 + parsed.minute
+
+
+def parse_clock_time(clock_time: str) -> Optional[int]:
+    """Convert a "10:00 AM"-style time to minutes after midnight, or None if invalid"""
+    try:
+        parsed = datetime.strptime(clock_time, "%I:%M %p")
+    except (TypeError, ValueError):
+        return None
+    return parsed.hour * 60 + parsed.minute
+
+
+@dataclass(frozen=True, slots=True)
+class MeetingTime:
+    """
+    A single weekly meeting of a section.
+
+    start_minute/end_minute are minutes after midnight (None when the time is
+    TBA or invalid) and day_mask is the DAY_BITS bit of the meeting day (0 if
+    unknown), so time checks are plain integer comparisons.
+    """
+
+    day: str
+    start_military: str
+    start_formatted: str
+    end_military: str
+    end_formatted: str
+    building: str
+    room: str
+    mode: str
+    campus: str
+    start_minute: Optional[int] = None
+    end_minute: Optional[int] = None
+    day_mask: int = 0
+
+    def to_dict(self) -> Dict:
+        return {
+            "day": self.day,
+            "start_time": {
+                "military": self.start_military,
+                "formatted": self.start_formatted
+            },
+            "end_time": {
+                "military": self.end_military,
+                "formatted": self.end_formatted
+            },
+            "building": self.building,
+            "room": self.room,
+            "mode": self.mode,
+            "campus": self.campus
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class Section:
+    """A section of a course with its instructors and meeting times"""
+
+    number: str
+    index: str
+    instructors: Tuple[str, ...]
+    status: str
+    comments: str
+    meeting_times: Tuple[MeetingTime, ...]
+
+    def to_dict(self) -> Dict:
+        return {
+            "number": self.number,
+            "index": self.index,
+            "instructors": list(self.instructors),
+            "status": self.status,
+            "comments": self.comments,
+            "meeting_times": [meeting.to_dict() for meeting in self.meeting_times]
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class Course:
+    """
+    Compact, immutable representation of an enriched course.
+
+    Snapshots hold these records instead of nested dicts; to_dict produces
+    the JSON shape served by the API and is only called at the API edge.
+    """
+
+    course_string: str
+    title: str
+    subject: str
+    subject_description: str
+    course_number: str
+    description: str
+    credits: object
+    credits_description: str
+    school: str
+    campus_locations: Tuple[str, ...]
+    prerequisites: str
+    core_requirements: Tuple[Tuple[str, str], ...]  # (code, description)
+    sections: Tuple[Section, ...]
+
+    def to_dict(self, fields: Optional[Collection[str]] = None) -> Dict:
+        """
+        JSON shape served by the API. If fields is given, only those keys are
+        produced (in the usual order), e.g. HEADER_FIELDS to skip sections.
+        """
+        if fields is not None:
+            return {key: getter(self) for key, getter in _COURSE_FIELDS.items()
+                    if key in fields}
+        return {
+            "courseString": self.course_string,
+            "title": self.title,
+            "subject": self.subject,
+            "subjectDescription": self.subject_description,
+            "course_number": self.course_number,
+            "description": self.description,
+            "credits": self.credits,
+            "creditsDescription": self.credits_description,
+            "school": self.school,
+            "campusLocations": list(self.campus_locations),
+            "prerequisites": self.prerequisites,
+            "coreRequirements": [
+                {"code": code, "description": description}
+                for code, description in self.core_requirements
+            ],
+            "sections": [section.to_dict() for section in self.sections]
+        }
+
+
+# API field name -> accessor, in the order to_dict emits them
+_COURSE_FIELDS = {
+    "courseString": lambda c: c.course_string,
+    "title": lambda c: c.title,
+    "subject": lambda c: c.subject,
+    "subjectDescription": lambda c: c.subject_description,
+    "course_number": lambda c: c.course_number,
+    "description": lambda c: c.description,
+    "credits": lambda c: c.credits,
+    "creditsDescription": lambda c: c.credits_description,
+    "school": lambda c: c.school,
+    "campusLocations": lambda c: list(c.campus_locations),
+    "prerequisites": lambda c: c.prerequisites,
+    "coreRequirements": lambda c: [
+        {"code": code, "description": description}
+        for code, description in c.core_requirements
+    ],
+    "sections": lambda c: [section.to_dict() for section in c.sections],
+}
+
+COURSE_FIELDS = tuple(_COURSE_FIELDS)
+
+# Course headers: everything except the bulky description and sections
+HEADER_FIELDS = tuple(
+    key for key in COURSE_FIELDS if key not in ("description", "sections"))
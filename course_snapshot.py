@@ -0,0 +1,77 @@
+import itertools
+from typing import Dict, Optional, Tuple
+from course_model import Course, Section
+from facet_index import FacetIndex
+from search_index import AutocompleteIndex, CourseSearchIndex
+
+# Process-wide, so every snapshot ever built has a distinct generation
+_generations = itertools.count(1)
+
+
+class CourseSnapshot:
+    """
+    An immutable, fully enriched view of the catalog for one
+    year/term/campus combination.
+
+    Snapshots are built once per refresh by CourseFetcher.update_courses and
+    published by replacing the reference held by CourseFetcher, so a reader
+    either sees the old snapshot or the new one, never a mix. Requests take
+    one snapshot and use it for everything they compute; the Course records
+    it contains are frozen and shared between requests. Every snapshot gets
+    a new generation number, which lets derived data such as cached API
+    responses tell whether it was computed from the snapshot currently
+    installed.
+    """
+
+    __slots__ = ("param_key", "courses", "fetched_at", "content_hash", "etag",
+                 "last_modified", "source_hashes", "source_layout", "source_positions",
+                 "search_index",
+                 "autocomplete_index", "facet_index", "sections_by_index",
+                 "generation")
+
+    def __init__(self, param_key: str, courses: Tuple[Course, ...], fetched_at: str,
+                 content_hash: Optional[str] = None, etag: Optional[str] = None,
+                 last_modified: Optional[str] = None,
+                 source_hashes: Optional[Dict[str, Tuple]] = None,
+                 source_layout: Tuple[Tuple[str, int, str], ...] = (),
+                 source_positions: Tuple[int, ...] = ()):
+        courses = tuple(courses)
+        object.__setattr__(self, "param_key", param_key)
+        object.__setattr__(self, "courses", courses)
+        object.__setattr__(self, "fetched_at", fetched_at)
+        # Validators of the API response this snapshot was built from
+        object.__setattr__(self, "content_hash", content_hash)
+        object.__setattr__(self, "etag", etag)
+        object.__setattr__(self, "last_modified", last_modified)
+        # courseString -> (course hash, ((section index, section hash), ...))
+        object.__setattr__(self, "source_hashes", source_hashes or {})
+        # The response's courses in API order, as (separator, raw JSON length,
+        # course hash) for json_stream.iter_json_array, and the position in
+        # courses each was enriched into (-1 if it could not be)
+        object.__setattr__(self, "source_layout", tuple(source_layout))
+        object.__setattr__(self, "source_positions", tuple(source_positions))
+        object.__setattr__(self, "search_index", CourseSearchIndex(courses))
+        object.__setattr__(self, "autocomplete_index", AutocompleteIndex(courses))
+        object.__setattr__(self, "facet_index", FacetIndex(courses))
+        object.__setattr__(self, "sections_by_index", _sections_by_index(courses))
+        object.__setattr__(self, "generation", next(_generations))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CourseSnapshot is immutable")
+
+    def __len__(self) -> int:
+        return len(self.courses)
+
+
+def _sections_by_index(courses: Tuple[Course, ...]) -> Dict[str, Tuple[Course, Section]]:
+    """Section index -> (course, section); the first course listing an index wins"""
+    sections: Dict[str, Tuple[Course, Section]] = {}
+    for course in courses:
+        for section in course.sections:
+            if section.index:
+                sections.setdefault(str(section.index), (course, section))
+    return sections
+
+
+# Stands in for the catalog when no courses could be loaded
+EMPTY_SNAPSHOT = CourseSnapshot("", (), None)
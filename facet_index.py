@@ -0,0 +1,140 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from course_model import Course
+
+# Facet name -> how a course's values for it are read
+_FACET_VALUES = {
+    "status": lambda course: (section.status for section in course.sections),
+    "location": lambda course: course.campus_locations,
+    "core": lambda course: (code for code, _ in course.core_requirements),
+    "credits": lambda course: (str(course.credits),) if course.credits is not None else (),
+    "school": lambda course: (course.school,),
+    "day": lambda course: (meeting.day for section in course.sections
+                           for meeting in section.meeting_times),
+    "mode": lambda course: (meeting.mode for section in course.sections
+                            for meeting in section.meeting_times),
+}
+
+FACETS = tuple(_FACET_VALUES)
+
+
+@dataclass(frozen=True)
+class CourseFilters:
+    """
+    Structured course filters. values maps a facet name to the values
+    accepted for it: a course matches a facet if it has any of them, and
+    must match every facet given. start_after/end_before (minutes after
+    midnight) keep courses with a section whose meetings all fall in
+    that window.
+    """
+
+    values: Mapping[str, Tuple[str, ...]] = field(default_factory=dict)
+    start_after: Optional[int] = None
+    end_before: Optional[int] = None
+
+    def __bool__(self) -> bool:
+        return bool(self.values) or self.start_after is not None or self.end_before is not None
+
+
+class FacetIndex:
+    """
+    Bitmap indexes over a snapshot's courses for structured filtering.
+
+    For every facet value there is one Python int with bit i set when the
+    course at position i has that value, so a filter is a handful of
+    OR/AND operations and a facet count is a popcount. Meeting time windows
+    are answered from per-section arrays instead, since whether a section
+    fits depends on its earliest start and latest end together.
+    """
+
+    __slots__ = ("size", "bitmaps", "_lookup", "_section_course",
+                 "_section_start", "_section_end")
+
+    def __init__(self, courses: Sequence[Course]):
+        self.size = len(courses)
+        positions: Dict[str, Dict[str, List[int]]] = {facet: {} for facet in FACETS}
+        section_course: List[int] = []
+        section_start: List[int] = []
+        section_end: List[int] = []
+
+        for pos, course in enumerate(courses):
+            for facet, values_of in _FACET_VALUES.items():
+                facet_positions = positions[facet]
+                for value in set(values_of(course)):
+                    if value:
+                        facet_positions.setdefault(value, []).append(pos)
+
+            for section in course.sections:
+                timed = [meeting for meeting in section.meeting_times
+                         if meeting.start_minute is not None and meeting.end_minute is not None]
+                if timed:
+                    section_course.append(pos)
+                    section_start.append(min(meeting.start_minute for meeting in timed))
+                    section_end.append(max(meeting.end_minute for meeting in timed))
+
+        self.bitmaps: Dict[str, Dict[str, int]] = {
+            facet: {value: self._positions_to_bits(value_positions)
+                    for value, value_positions in facet_positions.items()}
+            for facet, facet_positions in positions.items()
+        }
+        # Values are matched case-insensitively
+        self._lookup = {facet: {value.lower(): value for value in facet_bitmaps}
+                        for facet, facet_bitmaps in self.bitmaps.items()}
+        self._section_course = np.array(section_course, dtype=np.int32)
+        self._section_start = np.array(section_start, dtype=np.int32)
+        self._section_end = np.array(section_end, dtype=np.int32)
+
+    @property
+    def all_bits(self) -> int:
+        return (1 << self.size) - 1
+
+    def match(self, filters: CourseFilters) -> int:
+        """Bitmap of the courses matching every filter"""
+        bits = self.all_bits
+        for facet, values in filters.values.items():
+            lookup = self._lookup.get(facet, {})
+            facet_bitmaps = self.bitmaps.get(facet, {})
+            accepted = 0
+            for value in values:
+                accepted |= facet_bitmaps.get(lookup.get(value.lower()), 0)
+            bits &= accepted
+        if filters.start_after is not None or filters.end_before is not None:
+            bits &= self._window_bits(filters.start_after, filters.end_before)
+        return bits
+
+    def _window_bits(self, start_after: Optional[int], end_before: Optional[int]) -> int:
+        fits = np.ones(len(self._section_course), dtype=bool)
+        if start_after is not None:
+            fits &= self._section_start >= start_after
+        if end_before is not None:
+            fits &= self._section_end <= end_before
+        return self._positions_to_bits(self._section_course[fits])
+
+    def counts(self, bits: int) -> Dict[str, Dict[str, int]]:
+        """Per facet value, how many of the courses in bits have it"""
+        counts = {}
+        for facet, facet_bitmaps in self.bitmaps.items():
+            facet_counts = {}
+            for value, value_bits in facet_bitmaps.items():
+                count = (value_bits & bits).bit_count()
+                if count:
+                    facet_counts[value] = count
+            counts[facet] = facet_counts
+        return counts
+
+    def _positions_to_bits(self, positions: List[int]) -> int:
+        mask = np.zeros(self.size, dtype=bool)
+        mask[positions] = True
+        return self.to_bits(mask)
+
+    def to_bits(self, mask: np.ndarray) -> int:
+        """Bitmap of a boolean array over course positions"""
+        return int.from_bytes(np.packbits(mask, bitorder="little").tobytes(), "little")
+
+    def to_mask(self, bits: int) -> np.ndarray:
+        """Boolean array over course positions of a bitmap"""
+        raw = np.frombuffer(bits.to_bytes((self.size + 7) // 8, "little"), dtype=np.uint8)
+        return np.unpackbits(raw, bitorder="little")[:self.size].astype(bool)
@@ -0,0 +1,128 @@
+import codecs
+import json
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence, Tuple
+
+_WHITESPACE = " \t\n\r"
+
+# Largest single array element we are willing to buffer while waiting for it
+# to complete; anything bigger is treated as a malformed document
+MAX_ELEMENT_SIZE = 16 * 1024 * 1024
+
+# Yielded in place of an element that repeats a known element, see iter_json_array
+REPEATED = object()
+
+
+def iter_json_array(chunks: Iterable[bytes],
+                    known: Sequence[Tuple[str, int, str]] = (),
+                    digest: Optional[Callable[[str], str]] = None
+                    ) -> Iterator[Tuple[Any, str, str]]:
+    """
+    Incrementally decode a top-level JSON array from a stream of byte chunks.
+
+    Yields (element, raw_text, separator) for every array element as soon as
+    it is complete, so the full document is never held in memory. raw_text is
+    the exact JSON source of the element and can be hashed to detect changes;
+    separator is the source between the previous element (or the start of
+    the document) and this one, e.g. "[" or ", ".
+
+    known describes the elements of an earlier version of the document as
+    (separator, len(raw_text), digest(raw_text)). While the stream repeats
+    those elements from the start, character for character, they are yielded
+    as REPEATED without being decoded, so reading an unchanged document costs
+    about as much as hashing it. From the first difference on, elements are
+    decoded as usual.
+    Raises json.JSONDecodeError if the stream is not a well-formed array.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    pos = 0
+    # The separator before the next element starts at separator_start in
+    # buffer; separator holds the part already dropped from buffer
+    separator_start = 0
+    separator = ""
+    started = False
+    finished = False
+    expect_value = True
+    count = 0
+    replaying = bool(known)
+
+    chunks = iter(chunks)
+    at_end = False
+    while not at_end:
+        chunk = next(chunks, None)
+        at_end = chunk is None
+        text = text_decoder.decode(b"", final=True) if at_end else text_decoder.decode(chunk)
+        separator += buffer[separator_start:pos]
+        buffer = buffer[pos:] + text
+        pos = separator_start = 0
+        length = len(buffer)
+
+        while pos < length:
+            if replaying:
+                if count == len(known):
+                    replaying = False
+                    continue
+                known_separator, raw_length, raw_digest = known[count]
+                raw_start = pos + len(known_separator)
+                end = raw_start + raw_length
+                if end > length and not at_end:
+                    # Wait for the rest of the element
+                    break
+                raw_text = buffer[raw_start:end]
+                # Only elements with a closing delimiter are complete no
+                # matter what follows them
+                if (end <= length and raw_text[:1] in ("{", "[", '"') and
+                        buffer[pos:raw_start] == known_separator and
+                        digest(raw_text) == raw_digest):
+                    yield REPEATED, raw_text, known_separator
+                    started = True
+                    expect_value = False
+                    count += 1
+                    pos = separator_start = end
+                else:
+                    replaying = False
+                continue
+
+            char = buffer[pos]
+            if char in _WHITESPACE:
+                pos += 1
+            elif finished:
+                raise json.JSONDecodeError("Extra data", buffer, pos)
+            elif not started:
+                if char != "[":
+                    raise json.JSONDecodeError("Expecting '['", buffer, pos)
+                started = True
+                pos += 1
+            elif char == "]" and (not expect_value or count == 0):
+                finished = True
+                pos += 1
+            elif char == "," and not expect_value:
+                expect_value = True
+                pos += 1
+            elif not expect_value:
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+            else:
+                try:
+                    element, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    # Most likely the element continues in the next chunk
+                    if length - pos > MAX_ELEMENT_SIZE:
+                        raise
+                    break
+                if char not in "{[\"" and (end == length or
+                                           buffer[end] not in ",]" + _WHITESPACE):
+                    # A bare number could still be cut off mid-token
+                    break
+                yield element, buffer[pos:end], separator + buffer[separator_start:pos]
+                count += 1
+                separator = ""
+                pos = separator_start = end
+                expect_value = False
+
+    if not finished:
+        buffer = buffer[pos:]
+        # Surface the decoder's own error message for truncated documents
+        if buffer.strip() and expect_value and started:
+            decoder.raw_decode(buffer.strip())
+        raise json.JSONDecodeError("Unterminated JSON array", buffer, len(buffer))
@@ -0,0 +1,157 @@
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+
+from course_fetcher import CourseFetcher
+from course_snapshot import CourseSnapshot
+from room_fetcher import RoomFetcher
+from room_snapshot import RoomSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Rough in-memory footprints used to weigh loaded terms against the memory
+# budget, measured with tracemalloc on a 4,500-course catalog. A course
+# snapshot costs about 5.3 KB per course: the Course records with their
+# sections, the search, autocomplete and facet indexes, sections by index
+# and the source hashes and layout kept for refreshes.
+APPROX_BYTES_PER_COURSE = int(5.5 * 1024)
+# A room snapshot costs its slot matrix (counted exactly) plus about 1.5 KB
+# per class meeting held in a room: the precomputed room schedules, search
+# documents, occupancy and gap intervals and the room list.
+APPROX_BYTES_PER_ROOM_MEETING = int(1.5 * 1024)
+
+
+class RefreshScheduler:
+    """
+    Keeps every term users actually look at fresh, and forgets the rest.
+
+    tick() is meant to be called periodically (every minute from the app's
+    BackgroundScheduler). Each loaded param_key is refreshed about every
+    refresh_interval seconds, randomly stretched or shortened by up to
+    jitter so terms loaded together don't keep hitting the API together.
+    Refreshes run in a small thread pool (sized so the campuses of one term
+    can refresh side by side), one at a time per term, and requests keep
+    being served the current snapshot meanwhile; a request that finds its
+    term overdue just schedules a refresh.
+
+    Terms nobody has requested for idle_ttl seconds are evicted, as are the
+    least recently used ones while the loaded snapshots, together with the
+    room data room_fetcher derived from them, exceed memory_budget bytes.
+    Pinned terms are always kept and refreshed.
+    """
+
+    def __init__(self, course_fetcher: CourseFetcher,
+                 pinned: Iterable[Tuple[str, str, str]] = (("2025", "1", "NB"),),
+                 refresh_interval: float = 15 * 60,
+                 jitter: float = 0.2,
+                 max_workers: int = 3,
+                 idle_ttl: float = float(os.environ.get("COURSE_IDLE_TTL", 6 * 3600)),
+                 memory_budget: int = int(os.environ.get("COURSE_MEMORY_BUDGET_MB", 512)) * 1024 * 1024,
+                 room_fetcher: Optional[RoomFetcher] = None):
+        self.course_fetcher = course_fetcher
+        self.room_fetcher = room_fetcher
+        self.pinned = {f"{year}_{term}_{campus}": (year, term, campus)
+                       for year, term, campus in pinned}
+        self.refresh_interval = refresh_interval
+        self.jitter = jitter
+        self.idle_ttl = idle_ttl
+        self.memory_budget = memory_budget
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="course-refresh")
+        self._lock = threading.Lock()
+        self._in_flight = set()
+        self._next_due: Dict[str, float] = {}
+
+        course_fetcher.access_listeners.append(self._on_access)
+
+    def _interval(self) -> float:
+        return self.refresh_interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _params(self, param_key: str) -> Optional[Tuple[str, str, str]]:
+        return self.pinned.get(param_key) or self.course_fetcher.term_params.get(param_key)
+
+    def _on_access(self, snapshot: CourseSnapshot) -> None:
+        # Stale-while-revalidate: the caller keeps the snapshot it was given
+        checked_at = self.course_fetcher.checked_at.get(snapshot.param_key)
+        if checked_at is not None and time.monotonic() - checked_at > self.refresh_interval:
+            self.refresh(snapshot.param_key)
+
+    def refresh(self, param_key: str) -> bool:
+        """Schedule a background refresh of param_key unless one is running"""
+        params = self._params(param_key)
+        if params is None:
+            return False
+        with self._lock:
+            if param_key in self._in_flight:
+                return False
+            self._in_flight.add(param_key)
+            self._next_due[param_key] = time.monotonic() + self._interval()
+        self._executor.submit(self._refresh, param_key, params)
+        return True
+
+    def _refresh(self, param_key: str, params: Tuple[str, str, str]) -> None:
+        try:
+            self.course_fetcher.update_courses(*params)
+        except Exception as e:
+            logger.error(f"Background refresh of {param_key} failed: {str(e)}")
+        finally:
+            with self._lock:
+                self._in_flight.discard(param_key)
+
+    def tick(self) -> None:
+        """Evict cold terms, then start refreshes for the terms that are due"""
+        now = time.monotonic()
+        fetcher = self.course_fetcher
+
+        for param_key, params in self.pinned.items():
+            if param_key not in fetcher.courses_by_params:
+                self.refresh(param_key)
+
+        loaded = [key for key in list(fetcher.courses_by_params) if key not in self.pinned]
+        for param_key in loaded:
+            if now - fetcher.last_access.get(param_key, now) > self.idle_ttl:
+                self._evict(param_key, "idle")
+
+        # Least recently used first
+        loaded = sorted((key for key in list(fetcher.courses_by_params) if key not in self.pinned),
+                        key=lambda key: fetcher.last_access.get(key, 0.0))
+        while loaded and self.memory_usage() > self.memory_budget:
+            self._evict(loaded.pop(0), "over memory budget")
+
+        for param_key in list(fetcher.courses_by_params):
+            due = self._next_due.get(param_key)
+            if due is None:
+                # First sighting: spread the first refresh over a whole interval
+                self._next_due[param_key] = now + random.uniform(0, self.refresh_interval)
+            elif now >= due:
+                self.refresh(param_key)
+
+    def _evict(self, param_key: str, reason: str) -> None:
+        with self._lock:
+            if param_key in self._in_flight:
+                return
+            self._next_due.pop(param_key, None)
+        logger.info(f"Evicting courses for {param_key} ({reason})")
+        self.course_fetcher.evict_courses(param_key)
+
+    def memory_usage(self) -> int:
+        """Estimated bytes held by all loaded snapshots and the room data derived from them"""
+        usage = sum(len(snapshot) for snapshot in list(self.course_fetcher.courses_by_params.values())
+                    ) * APPROX_BYTES_PER_COURSE
+        if self.room_fetcher is not None:
+            usage += sum(self._room_snapshot_bytes(room_snapshot)
+                         for room_snapshot in list(self.room_fetcher.room_snapshots.values()))
+        return usage
+
+    @staticmethod
+    def _room_snapshot_bytes(room_snapshot: RoomSnapshot) -> int:
+        meetings = sum(len(meetings) for meetings in room_snapshot.meetings_by_room.values())
+        return room_snapshot.slots.busy.nbytes + meetings * APPROX_BYTES_PER_ROOM_MEETING
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
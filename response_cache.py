@@ -0,0 +1,116 @@
+import gzip
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, NamedTuple, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Content codings we can precompress bodies with, in order of preference
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    # mtime=0 keeps the output identical for identical bodies
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+    mimetype: str
+    # Content coding -> compressed body, filled in lazily by encoded_body
+    encodings: Dict[str, bytes]
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache of serialized API responses.
+
+    Keys are built by the caller from the endpoint, its normalized query
+    parameters and the snapshot generation the response was computed from,
+    so entries for an old generation are simply never asked for again.
+    CourseFetcher notifies the cache when a param_key gets a new snapshot and
+    the entries computed from it (responses spanning several campuses depend
+    on several param_keys) are dropped right away instead of waiting to be
+    evicted.
+    """
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._param_keys = {}  # cache key -> param_keys it was computed from
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Hashable, param_keys: Tuple[str, ...], entry: CachedResponse) -> None:
+        # A single response larger than the whole budget is not worth keeping
+        if len(entry.body) > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            self._param_keys[key] = param_keys
+            self._size += len(entry.body)
+            self._evict()
+
+    def encoded_body(self, key: Hashable, entry: CachedResponse, encoding: str) -> bytes:
+        """
+        entry's body compressed with encoding. It is compressed on first use
+        and kept with the entry, so it is produced at most once per snapshot
+        generation.
+        """
+        body = entry.encodings.get(encoding)
+        if body is not None:
+            return body
+        body = compress(entry.body, encoding)
+        with self._lock:
+            if encoding not in entry.encodings:
+                entry.encodings[encoding] = body
+                if self._entries.get(key) is entry:
+                    self._size += len(body)
+                    self._evict()
+            return entry.encodings[encoding]
+
+    def invalidate(self, param_key: str) -> None:
+        """Drop every response computed from param_key's data"""
+        with self._lock:
+            stale = [key for key, owners in self._param_keys.items() if param_key in owners]
+            for key in stale:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._param_keys.clear()
+            self._size = 0
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry.body) + sum(map(len, entry.encodings.values()))
+            del self._param_keys[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,8 +1,11 @@
 import logging
-import datetime
-from typing import Dict, List, Optional
+import threading
+from typing import Dict, List, Optional, Tuple
 from course_fetcher import CourseFetcher
-from rapidfuzz import fuzz, process
+from course_snapshot import EMPTY_SNAPSHOT, CourseSnapshot
+from course_model import FORMATTED_TIMES, MINUTES_PER_DAY, WEEKDAYS, parse_clock_time
+from room_snapshot import RoomSnapshot, meetings_by_room, room_schedule
+from single_flight import SingleFlight
 
 # Rutgers building coordinates (you can expand this dictionary)
 BUILDING_COORDINATES = {
@@ -30,6 +33,73 @@ class RoomFetcher:
         """Initialize the RoomFetcher with a course fetcher instance"""
         self.course_fetcher = course_fetcher
         self.logger = logging.getLogger(__name__)
+        
+        # param_key -> RoomSnapshot of the newest course snapshot seen
+        self.room_snapshots: Dict[str, RoomSnapshot] = {}
+        self._lock = threading.Lock()
+        self._builds = SingleFlight()
+        # Passes over a course catalog made to derive room data; each course
+        # snapshot generation should cost exactly one
+        self.catalog_passes = 0
+        
+        course_fetcher.update_listeners.append(self._on_course_update)
+
+    def _on_course_update(self, param_key: str, snapshot: Optional[CourseSnapshot]) -> None:
+        with self._lock:
+            in_use = self.room_snapshots.pop(param_key, None) is not None
+        # Rooms of a term already being looked at are derived again right
+        # away, on the thread installing the new catalog (normally a
+        # background refresh) rather than in the next request; others wait
+        # for their first room query
+        if in_use and snapshot is not None:
+            try:
+                self._builds.do((param_key, snapshot.generation),
+                                lambda: self._build_room_snapshot(snapshot))
+            except Exception as e:
+                self.logger.error(f"Error deriving rooms for {param_key}: {str(e)}")
+
+    def _get_snapshot(self, year: str, term: str, campus: str,
+                      snapshot: Optional[CourseSnapshot] = None) -> CourseSnapshot:
+        """
+        The snapshot a room query works on: the one passed in (e.g. pinned by
+        the request), else the current one for year/term/campus, else an
+        empty catalog.
+        """
+        if snapshot is not None:
+            return snapshot
+        try:
+            snapshot = self.course_fetcher.get_snapshot(year, term, campus)
+        except Exception as e:
+            self.logger.error(f"Error getting courses: {str(e)}")
+        return snapshot or EMPTY_SNAPSHOT
+
+    def _get_room_snapshot(self, year: str, term: str, campus: str,
+                           snapshot: Optional[CourseSnapshot] = None) -> RoomSnapshot:
+        """
+        The RoomSnapshot of the snapshot a room query works on, derived on
+        first use and shared until a newer course snapshot replaces it.
+        Concurrent first uses wait for a single build.
+        """
+        snapshot = self._get_snapshot(year, term, campus, snapshot)
+        room_snapshot = self.room_snapshots.get(snapshot.param_key)
+        if room_snapshot is not None and room_snapshot.generation == snapshot.generation:
+            return room_snapshot
+        return self._builds.do((snapshot.param_key, snapshot.generation),
+                               lambda: self._build_room_snapshot(snapshot))
+
+    def _build_room_snapshot(self, snapshot: CourseSnapshot) -> RoomSnapshot:
+        with self._lock:
+            self.catalog_passes += 1
+        meetings = meetings_by_room(snapshot.courses)
+        room_snapshot = RoomSnapshot(snapshot, meetings, self._extract_rooms(meetings))
+        
+        with self._lock:
+            current = self.room_snapshots.get(snapshot.param_key)
+            # Requests pinned to an older snapshot must not displace a newer one
+            if current is None or current.generation < room_snapshot.generation:
+                self.room_snapshots[snapshot.param_key] = room_snapshot
+        self.logger.info(f"Derived {len(room_snapshot)} rooms for {snapshot.param_key or 'empty catalog'}")
+        return room_snapshot
 
     def _get_room_coordinates(self, building: str) -> Optional[Dict[str, float]]:
         """
@@ -45,58 +115,56 @@ class RoomFetcher:
         """
         return BUILDING_TYPES.get(building.upper(), 'unknown')
 
-    def _extract_rooms_from_courses(self, courses: List[Dict]) -> List[Dict]:
+    def _extract_rooms(self, meetings_by_room: Dict[Tuple[str, str], Tuple]) -> List[Dict]:
         """
-        Extract and deduplicate room information from course data.
+        Extract and deduplicate room information from the meetings in each room.
         Returns a list of unique rooms with their details.
         """
         rooms = {}
         
-        for course in courses:
-            for section in course.get('sections', []):
-                for meeting_time in section.get('meeting_times', []):
-                    building = meeting_time.get('building', '')
-                    room = meeting_time.get('room', '')
-                    
-                    if not building or not room:
-                        continue
-                        
-                    room_key = f"{building}_{room}"
-                    
-                    if room_key not in rooms:
-                        # Get building coordinates and type
-                        coordinates = self._get_room_coordinates(building)
-                        building_type = self._get_building_type(building)
-                        
-                        rooms[room_key] = {
-                            'building': building,
-                            'room': room,
-                            'full_name': f"{building} {room}",
-                            'building_name': meeting_time.get('building_name', ''),
-                            'campus': meeting_time.get('campus', ''),
-                            'campus_name': meeting_time.get('campus_name', ''),
-                            'latitude': coordinates['lat'] if coordinates else None,
-                            'longitude': coordinates['lng'] if coordinates else None,
-                            'building_type': building_type
-                        }
+        for (building, room), meetings in meetings_by_room.items():
+            room_key = f"{building}_{room}"
+            
+            if room_key not in rooms:
+                # Get building coordinates and type
+                coordinates = self._get_room_coordinates(building)
+                building_type = self._get_building_type(building)
+                
+                rooms[room_key] = {
+                    'building': building,
+                    'room': room,
+                    'full_name': f"{building} {room}",
+                    # Meeting times carry no building or campus names
+                    'building_name': '',
+                    'campus': meetings[0][2].campus,
+                    'campus_name': '',
+                    'latitude': coordinates['lat'] if coordinates else None,
+                    'longitude': coordinates['lng'] if coordinates else None,
+                    'building_type': building_type
+                }
         
         return list(rooms.values())
 
-    def get_all_rooms(self, year="2025", term="1", campus="NB") -> List[Dict]:
+    def get_all_rooms(self, year="2025", term="1", campus="NB",
+                      snapshot: Optional[CourseSnapshot] = None) -> List[Dict]:
         """
         Retrieve a list of all unique rooms from the course data.
         """
-        courses = self.course_fetcher.get_courses(year=year, term=term, campus=campus)
-        return self._extract_rooms_from_courses(courses)
+        room_snapshot = self._get_room_snapshot(year, term, campus, snapshot)
+        # Copies, as callers annotate the rooms they return
+        return [room.copy() for room in room_snapshot.rooms]
 
     def search_rooms(self, query: str, year="2025", term="1", campus="NB", 
-                    building_types: List[str] = None, campus_filters: List[str] = None) -> List[Dict]:
+                    building_types: List[str] = None, campus_filters: List[str] = None,
+                    snapshot: Optional[CourseSnapshot] = None) -> List[Dict]:
         """
         Search for rooms matching the given query using fuzzy matching and semantic search.
         Enhanced to better handle full room names, building names, and course-related searches.
         Includes search by school, campus location, prerequisites, and core codes.
         """
-        all_rooms = self.get_all_rooms(year, term, campus)
+        snapshot = self._get_snapshot(year, term, campus, snapshot)
+        room_snapshot = self._get_room_snapshot(year, term, campus, snapshot)
+        all_rooms = self.get_all_rooms(year, term, campus, snapshot=snapshot)
         
         # Apply building type filters
         if building_types:
@@ -109,39 +177,6 @@ class RoomFetcher:
         if not query:
             return all_rooms
         
-        # Get all courses for semantic search
-        courses = self.course_fetcher.get_courses(year=year, term=term, campus=campus)
-        
-        # Create a mapping of rooms to their associated courses with enhanced information
-        room_courses = {}
-        for course in courses:
-            for section in course.get('sections', []):
-                for meeting_time in section.get('meeting_times', []):
-                    building = meeting_time.get('building')
-                    room = meeting_time.get('room')
-                    if building and room:
-                        room_key = f"{building}_{room}"
-                        if room_key not in room_courses:
-                            room_courses[room_key] = []
-                        room_courses[room_key].append({
-                            'title': course.get('title', ''),
-                            'description': course.get('description', ''),
-                            'courseString': course.get('courseString', ''),
-                            'school': course.get('school', ''),
-                            'prerequisites': course.get('prerequisites', ''),
-                            'coreCodes': course.get('coreCodes', []),
-                            'campus': meeting_time.get('campus', ''),
-                            'campus_name': meeting_time.get('campus_name', '')
-                        })
-        
-        # Prepare search fields and weights
-        search_fields = [
-            ('full_name', 100),      # Highest weight for full room name
-            ('building_name', 95),   # High weight for full building name
-            ('building', 90),        # High weight for building code
-            ('room', 80),            # Medium weight for room number
-        ]
-        
         # Check for direct matches first (case-insensitive exact or partial matches)
         query_lower = query.lower()
         direct_matches = []
@@ -163,81 +198,23 @@ class RoomFetcher:
         if direct_matches:
             return direct_matches
             
-        # Otherwise, proceed with fuzzy matching and semantic search
+        # Otherwise, score every room against the query at once: room fields
+        # and the courses taught in the room, from the snapshot's documents
+        search_index = room_snapshot.search_index
+        room_scores, doc_matches = search_index.score(query_lower)
         scored_rooms = []
         
         for room in all_rooms:
-            max_score = 0
-            
-            # Basic fuzzy matching on room fields
-            for field, weight in search_fields:
-                if field in room:
-                    # Normalize to string for fuzzy matching
-                    field_value = str(room[field]).lower()
-                    
-                    # Calculate scores with different fuzzy algorithms
-                    ratio_score = fuzz.ratio(query_lower, field_value) 
-                    partial_score = fuzz.partial_ratio(query_lower, field_value)
-                    token_sort_score = fuzz.token_sort_ratio(query_lower, field_value)
-                    token_set_score = fuzz.token_set_ratio(query_lower, field_value)
-                    
-                    # Use the highest score
-                    field_score = max(ratio_score, partial_score, token_sort_score, token_set_score)
-                    
-                    # Apply field weight and keep the highest overall score
-                    weighted_score = (field_score * weight) / 100
-                    max_score = max(max_score, weighted_score)
-            
-            # Semantic search through associated courses
             room_key = f"{room.get('building', '')}_{room.get('room', '')}"
-            if room_key in room_courses:
-                for course_info in room_courses[room_key]:
-                    # Search in course title and description
-                    title_score = fuzz.token_set_ratio(query_lower, course_info['title'].lower())
-                    desc_score = fuzz.token_set_ratio(query_lower, course_info['description'].lower())
-                    
-                    # Search in school
-                    school_score = fuzz.token_set_ratio(query_lower, course_info['school'].lower())
-                    
-                    # Search in prerequisites
-                    prereq_score = fuzz.token_set_ratio(query_lower, course_info['prerequisites'].lower())
-                    
-                    # Search in core codes
-                    core_codes_score = 0
-                    if course_info['coreCodes']:
-                        core_codes_text = ' '.join(course_info['coreCodes']).lower()
-                        core_codes_score = fuzz.token_set_ratio(query_lower, core_codes_text)
-                    
-                    # Search in campus location
-                    campus_score = fuzz.token_set_ratio(query_lower, course_info['campus_name'].lower())
-                    
-                    # Add course-related information to the room
-                    if any(score > 50 for score in [title_score, desc_score, school_score, prereq_score, core_codes_score, campus_score]):
-                        if 'courses' not in room:
-                            room['courses'] = []
-                        room['courses'].append({
-                            'title': course_info['title'],
-                            'code': course_info['courseString'],
-                            'school': course_info['school'],
-                            'prerequisites': course_info['prerequisites'],
-                            'coreCodes': course_info['coreCodes'],
-                            'campus': course_info['campus_name']
-                        })
-                    
-                    # Add semantic scores to overall score
-                    semantic_scores = [
-                        title_score * 0.8,      # Weight title matches
-                        desc_score * 0.7,       # Weight description matches
-                        school_score * 0.9,     # Weight school matches highly
-                        prereq_score * 0.6,     # Weight prerequisite matches
-                        core_codes_score * 0.8, # Weight core code matches
-                        campus_score * 0.9      # Weight campus matches highly
-                    ]
-                    semantic_score = max(semantic_scores)
-                    max_score = max(max_score, semantic_score)
+            row = search_index.row_of.get(room_key)
+            max_score = room_scores[row] if row is not None else 0
             
             # Only include rooms that meet the threshold
             if max_score >= 40:  # Lower threshold to catch more potential matches
+                # Add course-related information to the room
+                courses = search_index.matching_courses(room_key, doc_matches)
+                if courses:
+                    room['courses'] = courses
                 scored_rooms.append((room, max_score))
         
         # Sort by score descending
@@ -245,35 +222,6 @@ class RoomFetcher:
         
         return sorted_rooms
 
-    def _is_time_in_range(self, target_start: str, target_end: str, class_start: str, class_end: str) -> bool:
-        """
-        Check if a target time range overlaps with a class time range.
-        All times should be in 12-hour format (e.g., '10:00 AM', '2:30 PM').
-        
-        Returns True if there is any overlap between the target range and class range.
-        """
-        if class_start == 'TBA' or class_end == 'TBA':
-            return False
-            
-        try:
-            # Parse all times to datetime objects for comparison
-            # We use a dummy date just to have a complete datetime object
-            dummy_date = datetime.datetime.today().date()
-            
-            # Convert to datetime objects
-            time_format = '%I:%M %p'  # 12-hour format with AM/PM
-            target_start_dt = datetime.datetime.strptime(target_start, time_format).replace(year=dummy_date.year, month=dummy_date.month, day=dummy_date.day)
-            target_end_dt = datetime.datetime.strptime(target_end, time_format).replace(year=dummy_date.year, month=dummy_date.month, day=dummy_date.day)
-            class_start_dt = datetime.datetime.strptime(class_start, time_format).replace(year=dummy_date.year, month=dummy_date.month, day=dummy_date.day)
-            class_end_dt = datetime.datetime.strptime(class_end, time_format).replace(year=dummy_date.year, month=dummy_date.month, day=dummy_date.day)
-            
-            # Check for any overlap between the ranges
-            # Two ranges overlap if one range's start is before the other's end and vice versa
-            return (target_start_dt < class_end_dt and class_start_dt < target_end_dt)
-        except ValueError as e:
-            self.logger.error(f"Error parsing time: {e}")
-            return False
-    
     def _filter_by_campus(self, rooms: List[Dict], campus_filter: str) -> List[Dict]:
         """
         Filter rooms by specific campus.
@@ -352,22 +300,35 @@ class RoomFetcher:
         return filtered_rooms
 
     def find_available_rooms(self, day: str, start_time: str, end_time: str, year="2025", 
-                            term="1", campus="NB", campus_filter="", search: str = "") -> List[Dict]:
+                            term="1", campus="NB", campus_filter="", search: str = "",
+                            min_duration: Optional[int] = None,
+                            snapshot: Optional[CourseSnapshot] = None) -> List[Dict]:
         """
         Find rooms that are available during a specific day and time range.
         
         Parameters:
-        - day: Day of the week (Monday, Tuesday, etc.)
+        - day: Day of the week (Monday, Tuesday, etc.), or several separated
+          by commas (e.g., 'Monday,Wednesday') for rooms free on all of them
         - start_time: Start time of range to check (e.g., '10:00 AM')
-        - end_time: End time of range to check (e.g., '11:00 AM')
+        - end_time: End time of range to check (e.g., '11:00 AM'); may be
+          empty when min_duration is given, for a range of that length
         - year, term, campus: Academic period parameters
         - campus_filter: Optional campus filter (e.g., "College Ave", "Busch")
         - search: Optional search query to filter rooms
+        - min_duration: Optional minutes the room must stay free in a row
+          within the range, rather than for all of it
         
         Returns a list of available rooms with their details.
+        Raises ValueError if day names no day or a day not in WEEKDAYS.
         """
+        days = [name.strip() for name in day.split(',') if name.strip()]
+        if not days or any(name not in WEEKDAYS for name in days):
+            raise ValueError(f"Unknown day {day!r}")
+        
         # Get all rooms (optionally filtered by search query)
-        all_rooms = self.search_rooms(search, year, term, campus)
+        snapshot = self._get_snapshot(year, term, campus, snapshot)
+        room_snapshot = self._get_room_snapshot(year, term, campus, snapshot)
+        all_rooms = self.search_rooms(search, year, term, campus, snapshot=snapshot)
         
         # Apply campus filter if specified
         if campus_filter:
@@ -375,151 +336,145 @@ class RoomFetcher:
             
         available_rooms = []
         
-        # Get all course data for scheduling analysis
-        courses = self.course_fetcher.get_courses(year=year, term=term, campus=campus)
+        # Parse the requested range once; every comparison below is on integers
+        target_start = parse_clock_time(start_time)
+        if not end_time and min_duration is not None and target_start is not None:
+            target_end = min(target_start + min_duration, MINUTES_PER_DAY - 1)
+            end_time = FORMATTED_TIMES[target_end]
+        else:
+            target_end = parse_clock_time(end_time)
+        
+        if target_start is None or target_end is None:
+            # An unparseable requested range never conflicts
+            self.logger.error(f"Error parsing time range: {start_time} - {end_time}")
+            is_free = lambda building, room: True
+        elif len(days) == 1 and min_duration is None:
+            # One day and range: exact overlap test against the occupancy index
+            busy_rooms = room_snapshot.occupancy.busy_rooms(days[0], target_start, target_end)
+            is_free = lambda building, room: (building, room) not in busy_rooms
+        else:
+            # Several days or a minimum free duration: evaluated for every
+            # room at once on the snapshot's slot matrix
+            slots = room_snapshot.slots
+            free = slots.free_rooms(days, target_start, target_end, min_duration)
+            is_free = lambda building, room: (
+                (building, room) not in slots.row_of or bool(free[slots.row_of[(building, room)]]))
         
         for room_info in all_rooms:
-            building = room_info['building']
-            room = room_info['room']
-            
-            # Assume room is available until proven otherwise
-            is_available = True
-            
-            # Check all courses for this room
-            for course in courses:
-                for section in course.get('sections', []):
-                    for meeting_time in section.get('meeting_times', []):
-                        # Skip if not this room or day
-                        if (meeting_time.get('building') != building or 
-                            meeting_time.get('room') != room or
-                            meeting_time.get('day') != day):
-                            continue
-                        
-                        # Check if our target time range overlaps with this class's time range
-                        class_start = meeting_time.get('start_time', {}).get('formatted', 'TBA')
-                        class_end = meeting_time.get('end_time', {}).get('formatted', 'TBA')
-                        
-                        if self._is_time_in_range(start_time, end_time, class_start, class_end):
-                            is_available = False
-                            break
-                    
-                    if not is_available:
-                        break
-                
-                if not is_available:
-                    break
-            
-            # If still available after checking all courses, add to our list
-            if is_available:
+            if is_free(room_info['building'], room_info['room']):
                 # Add availability info to the room object
                 room_with_availability = room_info.copy()
                 room_with_availability['is_available'] = True
-                room_with_availability['checked_day'] = day
+                room_with_availability['checked_day'] = ','.join(days)
                 room_with_availability['checked_start_time'] = start_time
                 room_with_availability['checked_end_time'] = end_time
+                if min_duration is not None:
+                    room_with_availability['checked_min_duration'] = min_duration
                 available_rooms.append(room_with_availability)
         
         return available_rooms
 
-    def get_room_schedule(self, building: str, room: str, year="2025", term="1", campus="NB") -> Dict:
+    def find_free_now(self, day: str, minute: int, year="2025", term="1", campus="NB",
+                      campus_filter="", search: str = "", min_duration: int = 0,
+                      limit: Optional[int] = None,
+                      snapshot: Optional[CourseSnapshot] = None) -> List[Dict]:
         """
-        Get the schedule for a specific room, organized by day and time.
+        Rooms free on day at minute (minutes after midnight), longest
+        remaining free time first.
+        
+        Parameters:
+        - day: Day of the week (Monday, Tuesday, etc.)
+        - minute: The moment to check, in minutes after midnight
+        - campus_filter: Optional campus filter (e.g., "College Ave", "Busch")
+        - search: Optional search query to filter rooms
+        - min_duration: Only rooms staying free at least this many minutes
+        - limit: Optional maximum number of rooms returned
+        
+        Each room gets free_until ("3:20 PM", or "11:59 PM" when free for
+        the rest of the day) and free_minutes.
         """
-        courses = self.course_fetcher.get_courses(year=year, term=term, campus=campus)
-        
-        # Initialize the schedule structure
-        days_of_week = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-        schedule = {
-            "room_info": {
-                "building": building,
-                "room": room,
-                "full_name": f"{building} {room}",
-            },
-            "daily_schedule": {day: [] for day in days_of_week},
-            "weekly_schedule": []
-        }
+        snapshot = self._get_snapshot(year, term, campus, snapshot)
+        room_snapshot = self._get_room_snapshot(year, term, campus, snapshot)
+        all_rooms = self.search_rooms(search, year, term, campus, snapshot=snapshot)
+        if campus_filter:
+            all_rooms = self._filter_by_campus(all_rooms, campus_filter)
         
-        # Get all classes in this room
-        for course in courses:
-            for section in course.get('sections', []):
-                for meeting_time in section.get('meeting_times', []):
-                    if (meeting_time.get('building') == building and 
-                        meeting_time.get('room') == room and
-                        meeting_time.get('day')):  # Only include meetings with a defined day
-                        
-                        day = meeting_time.get('day')
-                        
-                        # Extract instructors properly
-                        instructors = []
-                        
-                        # First try to get from instructors field which is the preferred source
-                        if section.get('instructors'):
-                            # Handle different data structures for instructors
-                            instructor_list = section.get('instructors', [])
-                            for inst in instructor_list:
-                                if isinstance(inst, dict) and inst.get('name'):
-                                    instructors.append({"name": inst.get('name')})
-                                elif isinstance(inst, str):
-                                    instructors.append({"name": inst})
-                        
-                        # If no instructors found, try instructorsText field
-                        elif section.get('instructorsText'):
-                            instructor_text = section.get('instructorsText', '')
-                            if instructor_text and instructor_text.strip() != '':
-                                if ',' in instructor_text:
-                                    # Split by comma if multiple instructors 
-                                    instructor_names = [name.strip() for name in instructor_text.split(',')]
-                                    instructors = [{"name": name} for name in instructor_names if name]
-                                else:
-                                    # Single instructor
-                                    instructors = [{"name": instructor_text.strip()}]
-                        
-                        # As a fallback (should rarely happen)
-                        if not instructors:
-                            instructors = [{"name": "TBA"}]
-                        
-                        # Create class entry
-                        class_entry = {
-                            "course_name": course.get('title', 'Unknown'),
-                            "course_code": course.get('courseString', 'Unknown'),
-                            "section": section.get('number', 'Unknown'),
-                            "instructors": instructors,
-                            "instructor_text": section.get('instructorsText', 'TBA'),
-                            "start_time": meeting_time.get('start_time', {}).get('formatted', 'TBA'),
-                            "end_time": meeting_time.get('end_time', {}).get('formatted', 'TBA'),
-                            "meeting_mode": meeting_time.get('mode', 'Unknown'),
-                        }
-                        
-                        # Add to daily schedule
-                        if day in schedule["daily_schedule"]:
-                            schedule["daily_schedule"][day].append(class_entry)
-                        
-                        # Also add to the weekly schedule list
-                        weekly_entry = class_entry.copy()
-                        weekly_entry["day"] = day
-                        schedule["weekly_schedule"].append(weekly_entry)
-        
-        # Sort each day's classes by start time
-        for day in schedule["daily_schedule"]:
-            schedule["daily_schedule"][day].sort(
-                key=lambda x: x["start_time"] if x["start_time"] != "TBA" else "23:59"
-            )
-        
-        # Sort weekly schedule by day and then start time
-        day_order = {day: i for i, day in enumerate(days_of_week)}
-        schedule["weekly_schedule"].sort(
-            key=lambda x: (
-                day_order.get(x["day"], 99),  # Sort by day order
-                x["start_time"] if x["start_time"] != "TBA" else "23:59"  # Then by start time
-            )
-        )
-        
-        # Add availability status for each day
-        for day in days_of_week:
-            classes = schedule["daily_schedule"][day]
-            if not classes:
-                schedule["daily_schedule"][day] = {"classes": [], "status": "Available All Day"}
-            else:
-                schedule["daily_schedule"][day] = {"classes": classes, "status": "Classes Scheduled"}
-        
-        return schedule
\ No newline at end of file
+        rooms_by_key = {(room_info['building'], room_info['room']): room_info
+                        for room_info in all_rooms}
+        free = room_snapshot.gaps.free_now(day, minute, rooms_by_key, min_duration)
+        
+        free_rooms = []
+        for room_key, until in free[:limit]:
+            room_with_availability = rooms_by_key[room_key].copy()
+            room_with_availability['is_available'] = True
+            room_with_availability['checked_day'] = day
+            room_with_availability['checked_time'] = FORMATTED_TIMES[minute]
+            room_with_availability['free_until'] = FORMATTED_TIMES[min(until, MINUTES_PER_DAY - 1)]
+            room_with_availability['free_minutes'] = until - minute
+            free_rooms.append(room_with_availability)
+        
+        return free_rooms
+
+    def get_room_availability(self, building: str, room: str, day: str, minute: int,
+                              year="2025", term="1", campus="NB", min_duration: int = 0,
+                              snapshot: Optional[CourseSnapshot] = None) -> Dict:
+        """
+        Whether a room is free on day at minute and until when, plus the next
+        stretch from then on that it stays free for at least min_duration
+        minutes (None if there is none left that day).
+        """
+        gaps = self._get_room_snapshot(year, term, campus, snapshot).gaps
+        until = gaps.free_until(building, room, day, minute)
+        next_free = gaps.next_free(building, room, day, minute, min_duration)
+        
+        return {
+            "building": building,
+            "room": room,
+            "full_name": f"{building} {room}",
+            "checked_day": day,
+            "checked_time": FORMATTED_TIMES[minute],
+            "is_available": until is not None,
+            "free_until": FORMATTED_TIMES[min(until, MINUTES_PER_DAY - 1)] if until is not None else None,
+            "free_minutes": until - minute if until is not None else 0,
+            "next_free": {
+                "start_time": FORMATTED_TIMES[next_free[0]],
+                "end_time": FORMATTED_TIMES[min(next_free[1], MINUTES_PER_DAY - 1)],
+                "minutes": next_free[1] - next_free[0]
+            } if next_free else None
+        }
+
+    def get_room_schedule(self, building: str, room: str, year="2025", term="1", campus="NB",
+                          snapshot: Optional[CourseSnapshot] = None) -> Dict:
+        """
+        Get the schedule for a specific room, organized by day and time.
+        Schedules are built once per room snapshot and shared, so callers
+        must not modify them.
+        """
+        room_snapshot = self._get_room_snapshot(year, term, campus, snapshot)
+        schedule = room_snapshot.schedules.get((building, room))
+        if schedule is None:
+            # No classes are held in this room
+            schedule = room_schedule(building, room, ())
+        return schedule
+
+    def get_room_schedules(self, rooms: List[Tuple[str, str]] = (), building: str = "",
+                           year="2025", term="1", campus="NB",
+                           snapshot: Optional[CourseSnapshot] = None) -> Dict[str, Dict]:
+        """
+        Get the schedules of many rooms at once: the (building, room) pairs
+        given, then every room of building if one is given. Returns
+        {full room name: schedule}, in that order.
+        """
+        room_snapshot = self._get_room_snapshot(year, term, campus, snapshot)
+        room_keys = list(rooms)
+        if building:
+            room_keys.extend((room_info['building'], room_info['room'])
+                             for room_info in room_snapshot.rooms_by_building.get(building, ()))
+        
+        schedules = {}
+        for room_building, room in room_keys:
+            schedule = room_snapshot.schedules.get((room_building, room))
+            if schedule is None:
+                schedule = room_schedule(room_building, room, ())
+            schedules[f"{room_building} {room}"] = schedule
+        return schedules
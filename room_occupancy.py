@@ -0,0 +1,210 @@
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from course_model import MINUTES_PER_DAY, WEEKDAYS, Course, MeetingTime, Section
+
+RoomKey = Tuple[str, str]
+
+_DAY_INDEX = {day: i for i, day in enumerate(WEEKDAYS)}
+
+
+class RoomOccupancy:
+    """
+    When each room is in use, as integer intervals per (building, room, day).
+
+    A room's meetings on a day are kept as their start minutes in ascending
+    order together with the running maximum of their end minutes. The
+    meetings starting before the end of a requested range are a prefix of
+    that order, found by binary search, and the room is busy exactly when
+    the latest of their ends falls after the start of the range. This is the
+    same overlap test as comparing the range against every meeting, without
+    merging meetings, so even inverted ranges get the same answers.
+    Meetings without a parseable time never make a room busy.
+    """
+
+    __slots__ = ("by_day",)
+
+    def __init__(self, meetings_by_room: Dict[RoomKey, Iterable[Tuple[Course, Section, MeetingTime]]]):
+        intervals: Dict[str, Dict[RoomKey, list]] = {}
+        for room_key, meetings in meetings_by_room.items():
+            for _, _, meeting_time in meetings:
+                if (meeting_time.day and meeting_time.start_minute is not None and
+                        meeting_time.end_minute is not None):
+                    intervals.setdefault(meeting_time.day, {}).setdefault(room_key, []).append(
+                        (meeting_time.start_minute, meeting_time.end_minute))
+
+        # day -> (building, room) -> (sorted starts, running max of ends)
+        self.by_day: Dict[str, Dict[RoomKey, Tuple[Tuple[int, ...], Tuple[int, ...]]]] = {}
+        for day, rooms in intervals.items():
+            day_index = {}
+            for room_key, room_intervals in rooms.items():
+                room_intervals.sort()
+                starts = tuple(start for start, _ in room_intervals)
+                max_ends = tuple(accumulate((end for _, end in room_intervals), max))
+                day_index[room_key] = (starts, max_ends)
+            self.by_day[day] = day_index
+
+    @staticmethod
+    def _overlaps(starts: Tuple[int, ...], max_ends: Tuple[int, ...],
+                  start_minute: int, end_minute: int) -> bool:
+        count = bisect_left(starts, end_minute)
+        return count > 0 and max_ends[count - 1] > start_minute
+
+    def is_busy(self, building: str, room: str, day: str,
+                start_minute: int, end_minute: int) -> bool:
+        """Whether any meeting in the room on day overlaps [start_minute, end_minute)"""
+        entry = self.by_day.get(day, {}).get((building, room))
+        return entry is not None and self._overlaps(*entry, start_minute, end_minute)
+
+    def busy_rooms(self, day: str, start_minute: int, end_minute: int) -> Set[RoomKey]:
+        """Every (building, room) with a meeting overlapping the range on day"""
+        return {room_key for room_key, (starts, max_ends) in self.by_day.get(day, {}).items()
+                if self._overlaps(starts, max_ends, start_minute, end_minute)}
+
+
+class RoomSlotMatrix:
+    """
+    Whole-campus occupancy as a boolean NumPy array of rooms x 7 days x
+    5-minute slots, True where a meeting uses the slot.
+
+    Questions about every room at once ("free Tuesday 2:00-3:20", "free on
+    both Monday and Wednesday 10-11", "free for 90 minutes from now") are
+    slices of that array reduced with any/all. Meetings and requested
+    ranges are rounded outwards to whole slots, which changes nothing for
+    catalog times as those fall on 5-minute marks.
+    """
+
+    SLOT_MINUTES = 5
+    SLOTS_PER_DAY = MINUTES_PER_DAY // SLOT_MINUTES
+
+    __slots__ = ("rooms", "row_of", "busy")
+
+    def __init__(self, meetings_by_room: Dict[RoomKey, Iterable[Tuple[Course, Section, MeetingTime]]]):
+        self.rooms: Tuple[RoomKey, ...] = tuple(meetings_by_room)
+        self.row_of: Dict[RoomKey, int] = {room_key: row for row, room_key in enumerate(self.rooms)}
+        self.busy = np.zeros((len(self.rooms), len(WEEKDAYS), self.SLOTS_PER_DAY), dtype=bool)
+        for row, meetings in enumerate(meetings_by_room.values()):
+            for _, _, meeting_time in meetings:
+                day = _DAY_INDEX.get(meeting_time.day)
+                if (day is not None and meeting_time.start_minute is not None and
+                        meeting_time.end_minute is not None):
+                    first, last = self._slots(meeting_time.start_minute, meeting_time.end_minute)
+                    self.busy[row, day, first:last] = True
+
+    @classmethod
+    def _slots(cls, start_minute: int, end_minute: int) -> Tuple[int, int]:
+        """Slot range [first, last) covering [start_minute, end_minute)"""
+        first = max(start_minute, 0) // cls.SLOT_MINUTES
+        last = -(-min(end_minute, MINUTES_PER_DAY) // cls.SLOT_MINUTES)  # round up
+        return first, max(first, last)
+
+    def free_rooms(self, days: Sequence[str], start_minute: int, end_minute: int,
+                   min_minutes: Optional[int] = None) -> np.ndarray:
+        """
+        Boolean array over self.rooms: rooms free on every one of days from
+        start_minute to end_minute, or, with min_minutes, rooms that have
+        at least that many free minutes in a row within the range on every
+        day. Raises KeyError for a day name not in WEEKDAYS.
+        """
+        day_rows = [_DAY_INDEX[day] for day in dict.fromkeys(days)]
+        first, last = self._slots(start_minute, end_minute)
+        window = self.busy[:, day_rows, first:last]
+        if min_minutes is None:
+            return ~window.any(axis=(1, 2))
+
+        needed = max(-(-min_minutes // self.SLOT_MINUTES), 1)
+        if needed > last - first:
+            return np.zeros(len(self.rooms), dtype=bool)
+        # Busy slots in each run of `needed` consecutive slots, via prefix sums
+        busy_before = np.zeros(window.shape[:2] + (window.shape[2] + 1,), dtype=np.int32)
+        np.cumsum(window, axis=2, out=busy_before[:, :, 1:])
+        busy_in_run = busy_before[:, :, needed:] - busy_before[:, :, :-needed]
+        return (busy_in_run == 0).any(axis=2).all(axis=1)
+
+
+class RoomGaps:
+    """
+    Each room's free intervals per day, sorted, for "is it free now and
+    until when" questions.
+
+    A room's meetings on a day are merged and the rest of the day, from
+    midnight to midnight, is split into [start, end) gaps around them.
+    The gap holding a given minute, or the next gap long enough for a
+    given stay, is found by binary search on the gap ends. Rooms with no
+    timed meeting on a day are free all day.
+    """
+
+    __slots__ = ("by_day",)
+
+    def __init__(self, occupancy: RoomOccupancy):
+        # day -> (building, room) -> (gap starts, gap ends)
+        self.by_day: Dict[str, Dict[RoomKey, Tuple[Tuple[int, ...], Tuple[int, ...]]]] = {}
+        for day, rooms in occupancy.by_day.items():
+            day_gaps = {}
+            for room_key, (starts, max_ends) in rooms.items():
+                gap_starts, gap_ends = [], []
+                free_from = 0
+                for start, end in zip(starts, max_ends):
+                    if end <= start:
+                        continue  # empty meeting, outside any busy stretch
+                    if start > free_from:
+                        gap_starts.append(free_from)
+                        gap_ends.append(min(start, MINUTES_PER_DAY))
+                    free_from = max(free_from, end)
+                if free_from < MINUTES_PER_DAY:
+                    gap_starts.append(free_from)
+                    gap_ends.append(MINUTES_PER_DAY)
+                day_gaps[room_key] = (tuple(gap_starts), tuple(gap_ends))
+            self.by_day[day] = day_gaps
+
+    def gaps(self, building: str, room: str, day: str) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+        """(gap starts, gap ends) of the room on day"""
+        return self.by_day.get(day, {}).get((building, room), ((0,), (MINUTES_PER_DAY,)))
+
+    def free_until(self, building: str, room: str, day: str, minute: int) -> Optional[int]:
+        """End of the free interval the room is in at minute, or None if it is in use"""
+        starts, ends = self.gaps(building, room, day)
+        i = bisect_right(ends, minute)
+        if i < len(starts) and starts[i] <= minute:
+            return ends[i]
+        return None
+
+    def next_free(self, building: str, room: str, day: str, minute: int,
+                  min_minutes: int = 0) -> Optional[Tuple[int, int]]:
+        """
+        The first stretch, from minute on, that the room stays free for at
+        least min_minutes, as (start, end) of the rest of that gap, or None
+        if there is none left that day.
+        """
+        starts, ends = self.gaps(building, room, day)
+        for i in range(bisect_right(ends, minute), len(starts)):
+            start = max(starts[i], minute)
+            if ends[i] - start >= max(min_minutes, 1):
+                return start, ends[i]
+        return None
+
+    def free_now(self, day: str, minute: int, rooms: Iterable[RoomKey],
+                 min_minutes: int = 0) -> List[Tuple[RoomKey, int]]:
+        """
+        ((building, room), free until) for each of rooms that is free at
+        minute for at least min_minutes more, longest remaining first.
+        """
+        day_gaps = self.by_day.get(day, {})
+        free = []
+        for room_key in rooms:
+            gaps = day_gaps.get(room_key)
+            if gaps is None:
+                until = MINUTES_PER_DAY
+            else:
+                starts, ends = gaps
+                i = bisect_right(ends, minute)
+                if i == len(starts) or starts[i] > minute:
+                    continue
+                until = ends[i]
+            if until - minute >= max(min_minutes, 1):
+                free.append((room_key, until))
+        free.sort(key=lambda entry: entry[1], reverse=True)
+        return free
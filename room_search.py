@@ -0,0 +1,166 @@
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+from course_model import Course, MeetingTime, Section
+
+RoomKey = Tuple[str, str]
+
+# Room fields matched against the query, with their weights in percent
+ROOM_FIELD_WEIGHTS = (
+    ('full_name', 100),      # Highest weight for full room name
+    ('building_name', 95),   # High weight for full building name
+    ('building', 90),        # High weight for building code
+    ('room', 80),            # Medium weight for room number
+)
+
+# Course texts of the classes held in a room, with their weights. Core codes
+# and campus names were weighted too, but are always empty for rooms.
+COURSE_TEXT_WEIGHTS = (
+    ('title', 0.8),
+    ('description', 0.7),
+    ('school', 0.9),
+    ('prerequisites', 0.6),
+)
+
+ROOM_FIELD_SCORERS = (fuzz.ratio, fuzz.partial_ratio, fuzz.token_sort_ratio, fuzz.token_set_ratio)
+
+# Scores below this can neither reach the 40 a room needs to match (every
+# weight is at most 1) nor list a course under the room (which needs > 50)
+SCORE_CUTOFF = 40
+
+
+def _room_fields(building: str, room: str) -> Dict[str, str]:
+    # Meeting times carry no building names
+    return {'full_name': f"{building} {room}", 'building_name': '',
+            'building': building, 'room': room}
+
+
+class _Strings:
+    """Distinct strings, each scored once per query"""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def id_of(self, value: str) -> int:
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = self._ids[value] = len(self.values)
+            self.values.append(value)
+        return string_id
+
+
+class RoomSearchIndex:
+    """
+    Per-snapshot search documents for RoomFetcher.search_rooms.
+
+    Every room has its lowercased fields, and every class meeting in it the
+    lowercased title, description, school and prerequisites of its course.
+    Each distinct string is stored once, so a query is scored against the
+    whole campus with one rapidfuzz cdist call per scorer, and the weighted
+    maximum per room is taken with NumPy. Scores are the same as scoring
+    every room and every class meeting in it one by one.
+    """
+
+    __slots__ = ("rooms", "row_of", "_field_strings", "_field_ids", "_text_strings",
+                 "_doc_room", "_doc_texts", "_entries", "_entry_doc", "_entry_offsets")
+
+    def __init__(self, meetings_by_room: Dict[RoomKey, Iterable[Tuple[Course, Section, MeetingTime]]]):
+        # Rooms are told apart by "building_room", as in the room list
+        grouped: Dict[str, Tuple[RoomKey, list]] = {}
+        for room_key, meetings in meetings_by_room.items():
+            grouped.setdefault(f"{room_key[0]}_{room_key[1]}", (room_key, []))[1].extend(meetings)
+        self.rooms: Tuple[RoomKey, ...] = tuple(room_key for room_key, _ in grouped.values())
+        self.row_of: Dict[str, int] = {key: row for row, key in enumerate(grouped)}
+
+        field_strings = _Strings()
+        self._field_ids = np.array(
+            [[field_strings.id_of(_room_fields(building, room)[field].lower())
+              for field, _ in ROOM_FIELD_WEIGHTS]
+             for building, room in self.rooms], dtype=np.int32).reshape(-1, len(ROOM_FIELD_WEIGHTS))
+        self._field_strings = field_strings.values
+
+        # A document is one distinct combination of course texts in a room;
+        # entries are the class meetings, listed under a room when one of
+        # their texts matches
+        text_strings = _Strings()
+        course_texts: Dict[int, Tuple[int, ...]] = {}
+        docs: Dict[Tuple[int, ...], int] = {}
+        doc_room: List[int] = []
+        entries: List[Course] = []
+        entry_doc: List[int] = []
+        entry_offsets = [0]
+        for row, (_, meetings) in enumerate(grouped.values()):
+            for course, _, _ in meetings:
+                text_ids = course_texts.get(id(course))
+                if text_ids is None:
+                    text_ids = course_texts[id(course)] = tuple(
+                        text_strings.id_of(getattr(course, field).lower())
+                        for field, _ in COURSE_TEXT_WEIGHTS)
+                doc = docs.setdefault((row,) + text_ids, len(docs))
+                if doc == len(doc_room):
+                    doc_room.append(row)
+                entries.append(course)
+                entry_doc.append(doc)
+            entry_offsets.append(len(entries))
+
+        self._text_strings = text_strings.values
+        self._doc_room = np.array(doc_room, dtype=np.int32)
+        self._doc_texts = np.array([key[1:] for key in docs], dtype=np.int32).reshape(
+            -1, len(COURSE_TEXT_WEIGHTS))
+        self._entries = entries
+        self._entry_doc = entry_doc
+        self._entry_offsets = entry_offsets
+
+    @staticmethod
+    def _scores(query: str, choices: List[str], scorer) -> np.ndarray:
+        if not choices:
+            return np.zeros(0)
+        return process.cdist([query], choices, scorer=scorer, dtype=np.float64,
+                             score_cutoff=SCORE_CUTOFF)[0]
+
+    def score(self, query: str) -> Tuple[np.ndarray, List[bool]]:
+        """
+        Scores of every room for a lowercased query, as (room scores,
+        document matches): the weighted best score over the room's fields
+        and course texts, and for every document whether any of its
+        texts scores above 50.
+        """
+        room_scores = np.zeros(len(self.rooms))
+        if not len(self.rooms):
+            return room_scores, []
+
+        # Best of the four scorers for each distinct field value
+        field_scores = np.max([self._scores(query, self._field_strings, scorer)
+                               for scorer in ROOM_FIELD_SCORERS], axis=0)
+        for column, (_, weight) in enumerate(ROOM_FIELD_WEIGHTS):
+            room_scores = np.maximum(room_scores,
+                                     (field_scores[self._field_ids[:, column]] * weight) / 100)
+
+        text_scores = self._scores(query, self._text_strings, fuzz.token_set_ratio)
+        doc_text_scores = text_scores[self._doc_texts]
+        doc_scores = np.max([doc_text_scores[:, column] * weight
+                             for column, (_, weight) in enumerate(COURSE_TEXT_WEIGHTS)], axis=0) \
+            if len(self._doc_room) else np.zeros(0)
+        np.maximum.at(room_scores, self._doc_room, doc_scores)
+
+        doc_matches = (doc_text_scores > 50).any(axis=1).tolist()
+        return room_scores, doc_matches
+
+    def matching_courses(self, room_key: str, doc_matches: List[bool]) -> List[Dict]:
+        """The class meetings in a room ("building_room") whose course texts matched"""
+        row = self.row_of.get(room_key)
+        if row is None:
+            return []
+        start, end = self._entry_offsets[row], self._entry_offsets[row + 1]
+        return [{
+            'title': course.title,
+            'code': course.course_string,
+            'school': course.school,
+            'prerequisites': course.prerequisites,
+            'coreCodes': [],
+            'campus': ''
+        } for course, doc in zip(self._entries[start:end], self._entry_doc[start:end])
+            if doc_matches[doc]]
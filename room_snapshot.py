@@ -0,0 +1,138 @@
+from typing import Dict, Iterable, List, Tuple
+
+from course_model import MINUTES_PER_DAY, WEEKDAYS, Course, MeetingTime, Section
+from course_snapshot import CourseSnapshot
+from room_occupancy import RoomGaps, RoomOccupancy, RoomSlotMatrix
+from room_search import RoomSearchIndex
+
+RoomKey = Tuple[str, str]
+
+
+class RoomSnapshot:
+    """
+    Everything RoomFetcher knows about rooms for one course snapshot.
+
+    Derived once per course snapshot generation, in a single pass over the
+    catalog that collects every class meeting by (building, room). The room
+    list, per-building groupings, the availability and search indexes and
+    every room's schedule are all built from that grouping, and every room
+    query of a request reads from the same RoomSnapshot. Like the course
+    snapshot it is never modified once built; callers copy the room dicts
+    they hand out, and schedules are served as they are.
+    """
+
+    __slots__ = ("param_key", "generation", "meetings_by_room", "rooms", "rooms_by_key",
+                 "rooms_by_building", "occupancy", "slots", "gaps", "search_index",
+                 "schedules")
+
+    def __init__(self, course_snapshot: CourseSnapshot,
+                 meetings_by_room: Dict[RoomKey, Tuple[Tuple[Course, Section, MeetingTime], ...]],
+                 rooms: List[Dict]):
+        object.__setattr__(self, "param_key", course_snapshot.param_key)
+        object.__setattr__(self, "generation", course_snapshot.generation)
+        object.__setattr__(self, "meetings_by_room", meetings_by_room)
+        # Unique rooms in the order the catalog first mentions them
+        object.__setattr__(self, "rooms", tuple(rooms))
+        object.__setattr__(self, "rooms_by_key", {(room['building'], room['room']): room
+                                                  for room in rooms})
+        rooms_by_building: Dict[str, List[Dict]] = {}
+        for room in rooms:
+            rooms_by_building.setdefault(room['building'], []).append(room)
+        object.__setattr__(self, "rooms_by_building",
+                           {building: tuple(building_rooms)
+                            for building, building_rooms in rooms_by_building.items()})
+        object.__setattr__(self, "occupancy", RoomOccupancy(meetings_by_room))
+        object.__setattr__(self, "slots", RoomSlotMatrix(meetings_by_room))
+        object.__setattr__(self, "gaps", RoomGaps(self.occupancy))
+        object.__setattr__(self, "search_index", RoomSearchIndex(meetings_by_room))
+        object.__setattr__(self, "schedules", {room_key: room_schedule(*room_key, meetings)
+                                               for room_key, meetings in meetings_by_room.items()})
+
+    def __setattr__(self, name, value):
+        raise AttributeError("RoomSnapshot is immutable")
+
+    def __len__(self) -> int:
+        return len(self.rooms)
+
+
+def meetings_by_room(courses: Tuple[Course, ...]) -> Dict[RoomKey, Tuple]:
+    """
+    (building, room) -> ((course, section, meeting time), ...) for every
+    meeting with a known location, in course order. Rooms appear in the
+    order they are first met in the catalog.
+    """
+    rooms: Dict[RoomKey, List[Tuple[Course, Section, MeetingTime]]] = {}
+    for course in courses:
+        for section in course.sections:
+            for meeting_time in section.meeting_times:
+                if meeting_time.building and meeting_time.room:
+                    rooms.setdefault((meeting_time.building, meeting_time.room), []).append(
+                        (course, section, meeting_time))
+    return {room: tuple(meetings) for room, meetings in rooms.items()}
+
+
+_DAY_ORDER = {day: i for i, day in enumerate(WEEKDAYS)}
+
+
+def room_schedule(building: str, room: str,
+                  meetings: Iterable[Tuple[Course, Section, MeetingTime]]) -> Dict:
+    """
+    The schedule of a room, organized by day and time: every class meeting
+    with a defined day, per day and for the whole week, ordered by integer
+    (day, start minute) keys with classes without a start time last.
+    """
+    daily = {day: [] for day in WEEKDAYS}
+    weekly = []
+    
+    for course, section, meeting_time in meetings:
+        if not meeting_time.day:  # Only include meetings with a defined day
+            continue
+        day = meeting_time.day
+        
+        # Section instructors are already plain names
+        instructors = [{"name": name} for name in section.instructors]
+        
+        # As a fallback (should rarely happen)
+        if not instructors:
+            instructors = [{"name": "TBA"}]
+        
+        class_entry = {
+            "course_name": course.title,
+            "course_code": course.course_string,
+            "section": section.number,
+            "instructors": instructors,
+            "instructor_text": "TBA",
+            "start_time": meeting_time.start_formatted,
+            "end_time": meeting_time.end_formatted,
+            "meeting_mode": meeting_time.mode,
+        }
+        
+        # Classes without a start time sort last
+        start_key = (meeting_time.start_minute
+                     if meeting_time.start_minute is not None
+                     else MINUTES_PER_DAY)
+        
+        if day in daily:
+            daily[day].append((start_key, class_entry))
+        weekly_entry = class_entry.copy()
+        weekly_entry["day"] = day
+        weekly.append(((_DAY_ORDER.get(day, 99), start_key), weekly_entry))
+    
+    # Stable sorts, so classes starting together keep catalog order
+    daily_schedule = {}
+    for day, classes in daily.items():
+        classes.sort(key=lambda entry: entry[0])
+        daily_schedule[day] = ({"classes": [entry for _, entry in classes],
+                                "status": "Classes Scheduled"} if classes else
+                               {"classes": [], "status": "Available All Day"})
+    weekly.sort(key=lambda entry: entry[0])
+    
+    return {
+        "room_info": {
+            "building": building,
+            "room": room,
+            "full_name": f"{building} {room}",
+        },
+        "daily_schedule": daily_schedule,
+        "weekly_schedule": [entry for _, entry in weekly]
+    }
@@ -0,0 +1,210 @@
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from course_fetcher import CourseFetcher
+from course_model import MINUTES_PER_DAY, WEEKDAYS, Course, MeetingTime, Section
+from course_snapshot import CourseSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Granularity of the weekly time grid used to detect conflicts
+SLOT_MINUTES = 5
+SLOTS_PER_DAY = MINUTES_PER_DAY // SLOT_MINUTES
+
+_DAY_INDEX = {day: i for i, day in enumerate(WEEKDAYS)}
+
+
+def interval_mask(day: str, start_minute: int, end_minute: int) -> int:
+    """Bitmask of the week's time slots touched by [start_minute, end_minute) on day"""
+    if day not in _DAY_INDEX or end_minute <= start_minute:
+        return 0
+    first = start_minute // SLOT_MINUTES
+    last = min(-(-end_minute // SLOT_MINUTES), SLOTS_PER_DAY)  # round up
+    offset = _DAY_INDEX[day] * SLOTS_PER_DAY
+    return ((1 << (last - first)) - 1) << (offset + first)
+
+
+def week_mask(meeting_times: Iterable[MeetingTime]) -> int:
+    """Bitmask of the week's time slots used by a section's timed meetings"""
+    mask = 0
+    for meeting in meeting_times:
+        if meeting.day_mask and meeting.start_minute is not None and meeting.end_minute is not None:
+            mask |= interval_mask(meeting.day, meeting.start_minute, meeting.end_minute)
+    return mask
+
+
+class _Candidate:
+    __slots__ = ("course", "section", "mask", "penalty")
+
+    def __init__(self, course: Course, section: Section, mask: int, penalty: int):
+        self.course = course
+        self.section = section
+        self.mask = mask
+        self.penalty = penalty
+
+
+class ScheduleBuilder:
+    """
+    Builds conflict-free schedules (one section per requested course) from
+    the sections in a course snapshot.
+
+    Every section becomes a bitmask over the week's 5-minute slots, so two
+    sections conflict exactly when their masks share a bit. Schedules are
+    found by depth-first search over the courses, most constrained first,
+    which skips any section clashing with those already chosen and backs
+    out as soon as a remaining course has no compatible section left.
+    Schedules are ranked by how many sections meet away from the preferred
+    campus location; once max_results schedules are known, branches that
+    cannot beat the worst of them are pruned. The search stops at the
+    time budget and reports what it found so far.
+    """
+
+    def __init__(self, course_fetcher: CourseFetcher):
+        self.course_fetcher = course_fetcher
+
+    def build_schedules(self,
+                        course_strings: Sequence[str],
+                        year="2025",
+                        term="1",
+                        campus="NB",
+                        section_indices: Optional[Iterable[str]] = None,
+                        blackouts: Sequence[Tuple[str, int, int]] = (),
+                        location: Optional[str] = None,
+                        open_only: bool = False,
+                        max_results: int = 50,
+                        time_budget: float = 0.5,
+                        snapshot: Optional[CourseSnapshot] = None) -> Dict:
+        """
+        Conflict-free section combinations for the given course strings.
+
+        - section_indices: if any section of a course is listed, only the
+          listed sections of that course are considered
+        - blackouts: (day, start minute, end minute) periods to keep free
+        - location: preferred campus location, e.g. "Busch" (any case)
+        - open_only: skip sections that are not open
+
+        Returns {"schedules": [[(course, section), ...], ...], "missing":
+        course strings not offered, "unschedulable": courses with no usable
+        section, "complete": False if the time budget ran out}.
+        """
+        started = time.perf_counter()
+        if snapshot is None:
+            snapshot = self.course_fetcher.get_snapshot(year, term, campus)
+
+        wanted = set(str(index) for index in section_indices or ())
+        location = location.strip().lower() if location else None
+        blackout_mask = 0
+        for day, start_minute, end_minute in blackouts:
+            blackout_mask |= interval_mask(day, start_minute, end_minute)
+
+        missing = []
+        unschedulable = []
+        choices: List[List[_Candidate]] = []
+        for course_string in dict.fromkeys(course_strings):
+            positions = snapshot.search_index.by_course_string.get(course_string.strip().lower(), ()) if snapshot else ()
+            if not positions:
+                missing.append(course_string)
+                continue
+
+            sections = [(snapshot.courses[pos], section)
+                        for pos in positions for section in snapshot.courses[pos].sections]
+            if any(section.index in wanted for _, section in sections):
+                sections = [(course, section) for course, section in sections
+                            if section.index in wanted]
+
+            candidates = []
+            for course, section in sections:
+                if open_only and section.status != "OPEN":
+                    continue
+                mask = week_mask(section.meeting_times)
+                if mask & blackout_mask:
+                    continue
+                penalty = 0
+                if location:
+                    penalty = int(any(meeting.campus and meeting.campus.lower() != location
+                                      for meeting in section.meeting_times))
+                candidates.append(_Candidate(course, section, mask, penalty))
+
+            if not candidates:
+                unschedulable.append(course_string)
+            # Preferred-campus sections first, so good schedules are found early
+            candidates.sort(key=lambda candidate: candidate.penalty)
+            choices.append(candidates)
+
+        result = {"schedules": [], "missing": missing, "unschedulable": unschedulable,
+                  "complete": True}
+        if missing or unschedulable or not choices:
+            return result
+
+        # Most constrained course first keeps the search tree narrow; each
+        # schedule is listed back in the order the courses were requested
+        order = sorted(range(len(choices)), key=lambda i: len(choices[i]))
+        found, complete, nodes = self._search([choices[i] for i in order], max_results,
+                                              started + time_budget)
+        requested_order = sorted(range(len(order)), key=lambda i: order[i])
+        result["schedules"] = [[(schedule[i].course, schedule[i].section) for i in requested_order]
+                               for _, _, schedule in found]
+        result["complete"] = complete
+
+        logger.info(
+            f"Built {len(found)} schedules for {len(choices)} courses in "
+            f"{(time.perf_counter() - started) * 1000:.1f} ms ({nodes} nodes searched)")
+        return result
+
+    def _search(self, choices: List[List[_Candidate]], max_results: int,
+                deadline: float) -> Tuple[List[Tuple[int, int, List[_Candidate]]], bool, int]:
+        """
+        Branch and bound over the sections of each course. Returns up to
+        max_results (penalty, discovery order, schedule) entries with the
+        lowest penalties, whether the search finished, and the node count.
+        """
+        depth = len(choices)
+        # Lowest penalty still to come after each depth, for bounding
+        min_rest = [0] * (depth + 1)
+        for i in range(depth - 1, -1, -1):
+            min_rest[i] = min_rest[i + 1] + min(candidate.penalty for candidate in choices[i])
+
+        found: List[Tuple[int, int, List[_Candidate]]] = []
+        chosen: List[_Candidate] = []
+        state = {"nodes": 0, "stopped": False}
+
+        def worst_kept() -> int:
+            return max(entry[0] for entry in found)
+
+        def visit(level: int, occupied: int, penalty: int) -> None:
+            if level == depth:
+                entry = (penalty, state["nodes"], list(chosen))
+                if len(found) < max_results:
+                    found.append(entry)
+                else:
+                    # Replace the worst kept schedule (latest found among equals)
+                    worst = max(range(len(found)), key=lambda i: (found[i][0], found[i][1]))
+                    found[worst] = entry
+                return
+
+            for candidate in choices[level]:
+                if state["stopped"]:
+                    return
+                state["nodes"] += 1
+                if state["nodes"] % 1024 == 0 and time.perf_counter() > deadline:
+                    state["stopped"] = True
+                    return
+                if candidate.mask & occupied:
+                    continue
+                new_penalty = penalty + candidate.penalty
+                if (len(found) >= max_results and
+                        new_penalty + min_rest[level + 1] >= worst_kept()):
+                    # Candidates are sorted by penalty, so no later one does better
+                    break
+                new_occupied = occupied | candidate.mask
+                # Forward check: every remaining course needs a free section
+                if all(any(not (other.mask & new_occupied) for other in choices[rest])
+                       for rest in range(level + 1, depth)):
+                    chosen.append(candidate)
+                    visit(level + 1, new_occupied, new_penalty)
+                    chosen.pop()
+
+        visit(0, 0, 0)
+        found.sort(key=lambda entry: (entry[0], entry[1]))
+        return found, not state["stopped"], state["nodes"]
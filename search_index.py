@@ -0,0 +1,151 @@
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+from course_model import Course
+
+
+class CourseSearchIndex:
+    """
+    Pre-normalized search columns and exact-match hash maps for a snapshot.
+
+    Positions refer to the course order of the owning snapshot. Columns hold
+    the lowercased fields that fuzzy_search_courses compares against, and the
+    maps answer the course-code query patterns without scanning the catalog.
+    """
+
+    __slots__ = ("course_strings", "subjects", "course_numbers", "titles",
+                 "subject_descriptions", "by_course_string",
+                 "by_subject_number", "by_number", "by_subject",
+                 "fuzzy_choices", "has_duplicate_course_strings")
+
+    def __init__(self, courses: Sequence[Course]):
+        self.course_strings: List[str] = []
+        self.subjects: List[str] = []
+        self.course_numbers: List[str] = []
+        self.titles: List[str] = []
+        self.subject_descriptions: List[str] = []
+
+        by_course_string: Dict[str, List[int]] = {}
+        by_subject_number: Dict[Tuple[str, str], List[int]] = {}
+        by_number: Dict[str, List[int]] = {}
+        by_subject: Dict[str, List[int]] = {}
+
+        for pos, course in enumerate(courses):
+            course_string = course.course_string.lower()
+            subject = course.subject.lower()
+            course_number = course.course_number.lower()
+
+            self.course_strings.append(course_string)
+            self.subjects.append(subject)
+            self.course_numbers.append(course_number)
+            self.titles.append(course.title.lower())
+            self.subject_descriptions.append(course.subject_description.lower())
+
+            by_course_string.setdefault(course_string, []).append(pos)
+            by_subject_number.setdefault((subject, course_number), []).append(pos)
+            by_number.setdefault(course_number, []).append(pos)
+            by_subject.setdefault(subject, []).append(pos)
+
+        # All fuzzy-matched columns laid end to end so a query is scored
+        # against the whole catalog in a single cdist call
+        self.fuzzy_choices = (self.course_strings + self.titles + self.subjects +
+                              self.course_numbers + self.subject_descriptions)
+        self.has_duplicate_course_strings = len(by_course_string) != len(courses)
+
+        self.by_course_string = _freeze(by_course_string)
+        self.by_subject_number = _freeze(by_subject_number)
+        self.by_number = _freeze(by_number)
+        self.by_subject = _freeze(by_subject)
+
+    def __len__(self) -> int:
+        return len(self.course_strings)
+
+    def fuzzy_scores(self, query: str, threshold: float, workers: int = -1) -> np.ndarray:
+        """
+        Best token_set_ratio of the query against each course's fuzzy columns.
+        Scores below threshold come back as 0.
+        """
+        if not self.course_strings:
+            return np.zeros(0)
+        scores = process.cdist([query], self.fuzzy_choices,
+                               scorer=fuzz.token_set_ratio,
+                               score_cutoff=threshold,
+                               dtype=np.float64,
+                               workers=workers)
+        return scores.reshape(-1, len(self.course_strings)).max(axis=0)
+
+    def code_positions(self, query: str) -> Set[int]:
+        """Positions whose course string or "subject:number" equals the query"""
+        positions = set(self.by_course_string.get(query, ()))
+        if ":" in query:
+            subject, _, course_number = query.partition(":")
+            positions.update(self.by_subject_number.get((subject, course_number), ()))
+        return positions
+
+    def number_or_subject_positions(self, query: str) -> Set[int]:
+        """Positions whose course number or subject code equals the query"""
+        positions = set(self.by_number.get(query, ()))
+        positions.update(self.by_subject.get(query, ()))
+        return positions
+
+
+class AutocompleteIndex:
+    """
+    Sorted prefix index for as-you-type suggestions.
+
+    Every suggestion is filed under one or more lowercase keys: course
+    strings, "subject number" codes, subject descriptions, instructor names,
+    and titles starting at each of their words (so "calc" finds "Advanced
+    Calculus"). Keys are kept in one sorted list, so all keys with a given
+    prefix form a contiguous run found with a single bisect.
+    """
+
+    __slots__ = ("keys", "suggestions")
+
+    def __init__(self, courses: Sequence[Course]):
+        entries = set()
+        for course in courses:
+            course_string = course.course_string
+            code = f"{course.subject} {course.course_number}"
+            entries.add((course_string.lower(), "course", course_string, course_string))
+            entries.add((code.lower(), "code", code, course_string))
+            words = course.title.lower().split()
+            for i in range(len(words)):
+                entries.add((" ".join(words[i:]), "title", course.title, course_string))
+            if course.subject_description:
+                entries.add((course.subject_description.lower(), "subject",
+                             course.subject_description, None))
+            for section in course.sections:
+                for name in section.instructors:
+                    if name:
+                        entries.add((name.lower(), "instructor", name, None))
+
+        entries = sorted(entries, key=lambda entry: (entry[0], entry[1], entry[2], entry[3] or ""))
+        self.keys: List[str] = [entry[0] for entry in entries]
+        # (type, value, course string or None), parallel to keys
+        self.suggestions: List[Tuple[str, str, Optional[str]]] = [entry[1:] for entry in entries]
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Tuple[str, str, Optional[str]]]:
+        """Up to limit distinct suggestions with a key starting with prefix"""
+        prefix = " ".join(prefix.lower().split())
+        if not prefix:
+            return []
+
+        results = []
+        seen = set()
+        keys = self.keys
+        pos = bisect_left(keys, prefix)
+        while pos < len(keys) and len(results) < limit and keys[pos].startswith(prefix):
+            suggestion = self.suggestions[pos]
+            if suggestion not in seen:
+                seen.add(suggestion)
+                results.append(suggestion)
+            pos += 1
+        return results
+
+
+def _freeze(postings: Dict) -> Dict:
+    return {key: tuple(positions) for key, positions in postings.items()}
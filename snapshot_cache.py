@@ -0,0 +1,104 @@
+import logging
+import os
+import pickle
+import re
+import tempfile
+from typing import Optional
+
+from course_snapshot import CourseSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the pickled snapshot layout changes so stale files are ignored
+CACHE_FORMAT_VERSION = 6
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "COURSE_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cache"))
+
+_SAFE_KEY = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+class SnapshotCache:
+    """
+    Persists course snapshots to a local directory so a restarted app can
+    serve the last known catalog without waiting on the SOC API.
+
+    Each param_key is stored as one pickle file holding the Course records
+    together with their fetch timestamp, the validators (content hash, ETag,
+    Last-Modified) of the API response they were built from and the per-course
+    hashes and response layout used for incremental refreshes. Search indexes
+    are rebuilt on load.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def _path(self, param_key: str) -> Optional[str]:
+        # param_key is built from request arguments, so never let it escape
+        # the cache directory
+        if not _SAFE_KEY.match(param_key):
+            return None
+        return os.path.join(self.cache_dir, f"{param_key}.pickle")
+
+    def save(self, snapshot: CourseSnapshot) -> None:
+        """Atomically write a snapshot to disk"""
+        path = self._path(snapshot.param_key)
+        if path is None:
+            return
+
+        payload = {
+            "version": CACHE_FORMAT_VERSION,
+            "param_key": snapshot.param_key,
+            "fetched_at": snapshot.fetched_at,
+            "content_hash": snapshot.content_hash,
+            "etag": snapshot.etag,
+            "last_modified": snapshot.last_modified,
+            "source_hashes": snapshot.source_hashes,
+            "source_layout": snapshot.source_layout,
+            "source_positions": snapshot.source_positions,
+            "courses": snapshot.courses,
+        }
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            logger.info(f"Saved snapshot for {snapshot.param_key} to {path}")
+        except Exception as e:
+            logger.error(f"Failed to save snapshot for {snapshot.param_key}: {str(e)}")
+
+    def load(self, param_key: str) -> Optional[CourseSnapshot]:
+        """Load a previously saved snapshot, or None if there is no usable one"""
+        path = self._path(param_key)
+        if path is None or not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, "rb") as f:
+                payload = pickle.load(f)
+            if (payload.get("version") != CACHE_FORMAT_VERSION or
+                    payload.get("param_key") != param_key):
+                logger.info(f"Ignoring outdated snapshot cache file {path}")
+                return None
+
+            snapshot = CourseSnapshot(param_key, payload["courses"],
+                                      payload["fetched_at"],
+                                      content_hash=payload["content_hash"],
+                                      etag=payload["etag"],
+                                      last_modified=payload["last_modified"],
+                                      source_hashes=payload["source_hashes"],
+                                      source_layout=payload["source_layout"],
+                                      source_positions=payload["source_positions"])
+            logger.info(
+                f"Loaded {len(snapshot)} courses for {param_key} from disk "
+                f"(fetched at {snapshot.fetched_at})")
+            return snapshot
+        except Exception as e:
+            logger.error(f"Failed to load snapshot cache file {path}: {str(e)}")
+            return None
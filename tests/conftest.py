@@ -0,0 +1,121 @@
+import http.server
+import json
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# The app's modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course_fetcher import CourseFetcher  # noqa: E402
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "soc_courses.json")
+
+
+class _SOCHandler(http.server.BaseHTTPRequestHandler):
+    """Stand-in for the SOC courses.json endpoint"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.request_headers.append(dict(self.headers))
+        time.sleep(server.delay)
+
+        if ((server.etag and self.headers.get("If-None-Match") == server.etag) or
+                (server.last_modified and
+                 self.headers.get("If-Modified-Since") == server.last_modified)):
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = json.dumps(server.courses).encode()
+        self.send_response(server.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if server.etag:
+            self.send_header("ETag", server.etag)
+        if server.last_modified:
+            self.send_header("Last-Modified", server.last_modified)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_soc_server(courses):
+    """
+    Serve courses from a local stand-in for the SOC API until shutdown().
+    Responses can be shaped through the server's courses, status, delay,
+    etag and last_modified attributes; requests and request_headers record
+    what it received.
+    """
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _SOCHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.courses = courses
+    server.requests = 0
+    server.request_headers = []
+    server.delay = 0
+    server.status = 200
+    server.etag = None
+    server.last_modified = None
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/soc/api/courses.json"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def load_fixture_courses():
+    with open(FIXTURE) as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def soc_server():
+    server = start_soc_server(load_fixture_courses())
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_fetcher(url):
+    """A CourseFetcher reading from url, with nothing loaded yet"""
+    # Skip the initial load of the default term from the real API
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(CourseFetcher, "load_courses", lambda self, *args, **kwargs: None)
+        fetcher = CourseFetcher(cache_dir=None)
+    fetcher.base_url = url
+    return fetcher
+
+
+@pytest.fixture
+def fetcher(soc_server):
+    return make_fetcher(soc_server.url)
+
+
+@pytest.fixture(scope="session")
+def app_module():
+    """The Flask app module, serving the fixture catalog for every term"""
+    server = start_soc_server(load_fixture_courses())
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(CourseFetcher, "load_courses", lambda self, *args, **kwargs: None)
+        import app
+    app.scheduler.shutdown(wait=False)
+    app.limiter.enabled = False
+    app.course_fetcher.snapshot_cache = None
+    app.course_fetcher.base_url = server.url
+    yield app
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
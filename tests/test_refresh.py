@@ -0,0 +1,139 @@
+import copy
+
+import pytest
+
+from conftest import load_fixture_courses, make_fetcher
+
+PARAM_KEY = "2025_1_NB"
+
+
+def _load(fetcher):
+    return fetcher.get_snapshot("2025", "1", "NB")
+
+
+def _refresh(fetcher):
+    fetcher.update_courses("2025", "1", "NB")
+    return fetcher.courses_by_params[PARAM_KEY]
+
+
+@pytest.fixture
+def format_calls(fetcher, monkeypatch):
+    """Index of every section fetcher formats, in order"""
+    calls = []
+    format_section = fetcher.format_section
+
+    def counting_format_section(section):
+        calls.append(section.get("index"))
+        return format_section(section)
+
+    monkeypatch.setattr(fetcher, "format_section", counting_format_section)
+    return calls
+
+
+@pytest.fixture
+def installed(fetcher):
+    """Snapshots installed by fetcher, in order"""
+    snapshots = []
+    fetcher.update_listeners.append(lambda param_key, snapshot: snapshots.append(snapshot))
+    return snapshots
+
+
+def test_not_modified_keeps_snapshot(fetcher, soc_server, installed):
+    soc_server.etag = '"v1"'
+    soc_server.last_modified = "Wed, 01 Jan 2025 00:00:00 GMT"
+    snapshot = _load(fetcher)
+    checked_at = fetcher.checked_at[PARAM_KEY]
+
+    assert _refresh(fetcher) is snapshot
+    assert soc_server.requests == 2
+    assert soc_server.request_headers[-1]["If-None-Match"] == '"v1"'
+    assert soc_server.request_headers[-1]["If-Modified-Since"] == "Wed, 01 Jan 2025 00:00:00 GMT"
+    assert installed == [snapshot]
+    assert fetcher.checked_at[PARAM_KEY] > checked_at
+
+
+def test_unchanged_body_without_validators_installs_nothing(fetcher, soc_server,
+                                                            installed, format_calls):
+    snapshot = _load(fetcher)
+    format_calls.clear()
+
+    assert _refresh(fetcher) is snapshot
+    assert soc_server.requests == 2
+    assert "If-None-Match" not in soc_server.request_headers[-1]
+    assert installed == [snapshot]
+    # Every course repeats the previous response, so none is decoded again
+    assert format_calls == []
+
+
+def test_changed_section_is_the_only_one_reformatted(fetcher, soc_server, format_calls):
+    # Without the duplicated 01:640:151 every course string is unique, so
+    # every unchanged course can be matched to its previous version
+    soc_server.courses = load_fixture_courses()[:-1]
+    old = {course.course_string: course for course in _load(fetcher).courses}
+    format_calls.clear()
+
+    changed = copy.deepcopy(soc_server.courses)
+    # An early course, so most of the catalog after it is diffed rather than replayed
+    assert changed[2]["courseString"] == "01:198:205"
+    changed[2]["sections"][1]["openStatusText"] = "CLOSED"
+    soc_server.courses = changed
+    new = {course.course_string: course for course in _refresh(fetcher).courses}
+
+    assert format_calls == ["10021"]
+    assert new.keys() == old.keys()
+    for course_string, course in new.items():
+        if course_string != "01:198:205":
+            assert course is old[course_string]
+    sections, old_sections = new["01:198:205"].sections, old["01:198:205"].sections
+    assert sections[0] is old_sections[0] and sections[2] is old_sections[2]
+    assert sections[1].status == "CLOSED" != old_sections[1].status
+
+
+def test_refresh_matches_cold_build(fetcher, soc_server):
+    _load(fetcher)
+
+    courses = copy.deepcopy(soc_server.courses)
+    del courses[10]  # removed
+    courses[3], courses[20] = courses[20], courses[3]  # reordered
+    courses[25]["title"] = "CHANGED TITLE"  # changed
+    added = copy.deepcopy(courses[0])
+    added["courseString"] = "01:198:999"
+    added["courseNumber"] = "999"
+    added["sections"][0]["index"] = "99999"
+    courses.insert(15, added)  # added
+    soc_server.courses = courses
+    refreshed = _refresh(fetcher)
+
+    cold = _load(make_fetcher(soc_server.url))
+
+    assert refreshed is not cold
+    assert refreshed.courses == cold.courses
+    assert refreshed.source_hashes == cold.source_hashes
+    assert refreshed.source_layout == cold.source_layout
+    assert refreshed.source_positions == cold.source_positions
+    assert refreshed.content_hash == cold.content_hash
+
+
+def test_failed_load_leaves_no_bookkeeping(fetcher, soc_server):
+    soc_server.status = 404
+
+    for term in range(20):
+        with pytest.raises(Exception):
+            fetcher.get_snapshot("1999", str(term), "XX")
+
+    assert fetcher.courses_by_params == {}
+    assert fetcher.term_params == {}
+    assert fetcher.last_access == {}
+    assert fetcher.checked_at == {}
+
+
+def test_eviction_forgets_the_term(fetcher):
+    _load(fetcher)
+    assert PARAM_KEY in fetcher.term_params
+
+    fetcher.evict_courses(PARAM_KEY)
+
+    assert PARAM_KEY not in fetcher.courses_by_params
+    assert PARAM_KEY not in fetcher.term_params
+    assert PARAM_KEY not in fetcher.last_access
+    assert PARAM_KEY not in fetcher.checked_at
@@ -0,0 +1,46 @@
+def _courses(client, query):
+    response = client.get(f"/api/courses?{query}")
+    assert response.status_code == 200
+    return response
+
+
+def test_repeated_parameter_is_keyed_on_the_value_views_read(client):
+    first = _courses(client, "search=calculus&search=zzzzqqq")
+    second = _courses(client, "search=zzzzqqq&search=calculus")
+
+    assert first.get_data() == _courses(client, "search=calculus").get_data()
+    assert second.get_data() == _courses(client, "search=zzzzqqq").get_data()
+    assert first.get_data() != second.get_data()
+    assert first.headers["ETag"] != second.headers["ETag"]
+
+
+def test_empty_parameter_shares_the_cached_response(client):
+    plain = _courses(client, "search=calculus")
+    with_empty = _courses(client, "search=calculus&subject=")
+
+    assert with_empty.headers["ETag"] == plain.headers["ETag"]
+
+
+def test_matching_etag_gets_not_modified(client):
+    etag = _courses(client, "search=calculus").headers["ETag"]
+
+    response = client.get("/api/courses?search=calculus", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+
+
+def test_single_campus_endpoint_rejects_several_campuses(app_module, client):
+    for query in ("campus=ALL", "campus=NB,NK"):
+        response = client.get(f"/api/rooms?term=7&{query}")
+
+        assert response.status_code == 400
+    # Nothing was loaded for a request that could not use it
+    assert not [key for key in app_module.course_fetcher.courses_by_params
+                if key.startswith("2025_7_")]
+
+
+def test_courses_merge_several_campuses(app_module, client):
+    response = client.get("/api/courses?term=0&campus=NB,NK&search=calculus")
+
+    assert response.status_code == 200
+    assert {"2025_0_NB", "2025_0_NK"} <= app_module.course_fetcher.courses_by_params.keys()
@@ -0,0 +1,64 @@
+import pytest
+
+NINE_AM = 9 * 60
+
+
+@pytest.fixture
+def snapshot(app_module):
+    return app_module.course_fetcher.get_snapshot("2025", "1", "NB")
+
+
+def test_find_free_now_skips_busy_rooms(app_module, snapshot):
+    rooms = app_module.room_fetcher.find_free_now("Monday", NINE_AM, snapshot=snapshot)
+
+    names = [room["full_name"] for room in rooms]
+    # ARC 100 holds 01:198:111 on Mondays from 8:00 to 9:20
+    assert "ARC 100" not in names
+    assert names
+    assert all(room["checked_day"] == "Monday" for room in rooms)
+    assert all(room["checked_time"] == "9:00 AM" for room in rooms)
+    free_minutes = [room["free_minutes"] for room in rooms]
+    assert free_minutes == sorted(free_minutes, reverse=True)
+
+
+def test_free_now_endpoint(client):
+    response = client.get("/api/rooms/free-now?day=Monday&time=9:00 AM")
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["count"] == len(body["data"]) > 0
+    assert body["day"] == "Monday"
+    assert "ARC 100" not in [room["full_name"] for room in body["data"]]
+
+
+def test_free_now_endpoint_for_one_room(client):
+    response = client.get("/api/rooms/free-now?day=Monday&time=9:00 AM&building=ARC&room=100")
+
+    assert response.status_code == 200
+    availability = response.get_json()["data"]
+    assert availability["is_available"] is False
+    assert availability["next_free"]["start_time"] == "9:20 AM"
+
+
+def test_free_now_endpoint_rejects_unknown_day(client):
+    response = client.get("/api/rooms/free-now?day=Funday&time=9:00 AM")
+
+    assert response.status_code == 400
+
+
+def test_free_now_reports_its_own_terms_update(app_module, client):
+    own = app_module.course_fetcher.get_snapshot("2025", "3", "NB")
+    # Another term refreshed later moves the global last update on
+    app_module.course_fetcher.get_snapshot("2025", "4", "NB")
+    assert app_module.course_fetcher.last_update != own.fetched_at
+
+    for query in ("", "&building=ARC&room=100"):
+        response = client.get(f"/api/rooms/free-now?term=3&day=Monday&time=9:00 AM{query}")
+
+        assert response.get_json()["last_update"] == own.fetched_at
+
+
+def test_free_now_rejects_several_campuses(client):
+    response = client.get("/api/rooms/free-now?campus=ALL&day=Monday&time=9:00 AM")
+
+    assert response.status_code == 400
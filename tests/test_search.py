@@ -0,0 +1,133 @@
+import json
+import os
+
+import pytest
+
+from course_fetcher import CourseFetcher
+from course_snapshot import CourseSnapshot
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "soc_courses.json")
+
+# fuzzy_search_courses results over the fixture catalog, as returned by the
+# original linear scan over the raw course list
+EXPECTED = {
+    "cs 111": ["01:198:111"],
+    "198:111": ["01:198:111"],
+    "111": ["01:198:111", "01:640:111", "11:115:111"],
+    "cs": [],
+    "01:198:111": [
+        "01:198:111",
+        "01:198:112",
+        "01:198:211",
+        "01:119:115",
+        "01:119:116",
+        "01:198:142",
+        "01:090:101",
+        "01:198:205",
+        "01:198:336",
+        "01:198:344",
+        "01:640:111",
+        "01:830:101",
+        "01:920:101",
+        "01:960:211",
+        "04:189:101",
+        "11:115:111",
+    ],
+    "01:640:151": [
+        "01:640:151",
+        "01:640:151",
+        "01:640:111",
+        "01:640:152",
+        "01:640:251",
+        "01:160:159",
+        "01:640:250",
+        "01:960:211",
+        "01:090:101",
+        "01:730:101",
+        "01:830:101",
+        "01:920:101",
+        "01:960:212",
+    ],
+    "math 151": ["01:640:151", "01:640:151"],
+    "computer science 111": [
+        "01:198:111",
+        "01:198:112",
+        "01:198:142",
+        "01:198:205",
+        "01:198:211",
+        "01:198:336",
+        "01:198:344",
+        "01:640:111",
+        "11:115:111",
+    ],
+    "640:152": ["01:640:152"],
+    "198": [
+        "01:198:111",
+        "01:198:112",
+        "01:198:142",
+        "01:198:205",
+        "01:198:211",
+        "01:198:336",
+        "01:198:344",
+    ],
+    "cs 9999": [],
+    "calculus": ["01:640:151", "01:640:151", "01:640:152"],
+    "data structures": ["01:198:112"],
+    "general physics": ["01:750:203", "01:750:204"],
+    "organic chemistry": ["01:160:159", "01:160:307"],
+    "intro computer": [
+        "01:198:111",
+        "01:198:112",
+        "01:198:142",
+        "01:198:205",
+        "01:198:211",
+        "01:198:336",
+        "01:198:344",
+        "14:332:221",
+        "14:332:252",
+    ],
+    "statistics": ["01:960:211", "01:960:212"],
+    "economics": ["01:220:102", "01:220:103"],
+    "xyzzy": [],
+}
+
+
+@pytest.fixture(scope="module")
+def fetcher():
+    # Skip the initial load of the default term from the real API
+    monkeypatch = pytest.MonkeyPatch()
+    monkeypatch.setattr(CourseFetcher, "load_courses", lambda self, *args, **kwargs: None)
+    fetcher = CourseFetcher(cache_dir=None)
+    monkeypatch.undo()
+    return fetcher
+
+
+@pytest.fixture(scope="module")
+def snapshot(fetcher):
+    with open(FIXTURE) as f:
+        courses = json.load(f)
+    # Snapshots hold their courses sorted by course string
+    courses.sort(key=lambda course: course["courseString"])
+    return CourseSnapshot("2025_1_NB", [fetcher.enrich_course(course) for course in courses],
+                          "2025-01-01T00:00:00")
+
+
+@pytest.mark.parametrize("query", list(EXPECTED))
+def test_fuzzy_search_matches_original_ranking(fetcher, snapshot, query):
+    found = fetcher.fuzzy_search_courses(snapshot, query)
+
+    assert [course.course_string for course in found] == EXPECTED[query]
+
+
+@pytest.mark.parametrize("query", ["111", "01:640:151", "computer science 111", "calculus"])
+@pytest.mark.parametrize("limit", [1, 2, 5])
+def test_limited_search_is_a_prefix_of_the_full_ranking(fetcher, snapshot, query, limit):
+    found = fetcher.fuzzy_search_courses(snapshot, query, limit=limit)
+
+    assert [course.course_string for course in found] == EXPECTED[query][:limit]
+
+
+def test_search_is_case_and_whitespace_insensitive(fetcher, snapshot):
+    found = fetcher.fuzzy_search_courses(snapshot, "  CS 111 ")
+
+    assert [course.course_string for course in found] == EXPECTED["cs 111"]
@@ -0,0 +1,101 @@
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import pytest
+import requests
+
+
+COURSES = [
+    {
+        "courseString": "01:198:111",
+        "subject": "198",
+        "courseNumber": "111",
+        "title": "INTRO COMPUTER SCI",
+        "subjectDescription": "Computer Science",
+        "sections": [{"number": "01", "index": "09214", "openStatusText": "OPEN",
+                      "meetingTimes": [{"meetingDay": "M", "startTimeMilitary": "1020",
+                                        "endTimeMilitary": "1140", "buildingCode": "ARC",
+                                        "roomNumber": "103", "campusLocation": "2"}]}],
+    },
+    {
+        "courseString": "01:640:151",
+        "subject": "640",
+        "courseNumber": "151",
+        "title": "CALCULUS I MATH/PHYS",
+        "subjectDescription": "Mathematics",
+        "sections": [],
+    },
+]
+
+
+@pytest.fixture(autouse=True)
+def slow_soc_server(soc_server):
+    soc_server.courses = COURSES
+    soc_server.delay = 0.3
+
+
+def _run_together(count, target):
+    """Run target in count threads released at the same moment; returns their results"""
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def run(i):
+        barrier.wait()
+        try:
+            results[i] = target()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_cold_requests_share_one_fetch(fetcher, soc_server):
+    results = _run_together(50, lambda: fetcher.get_snapshot("2025", "9", "NB"))
+
+    assert soc_server.requests == 1
+    assert all(result is results[0] for result in results)
+    assert [course.course_string for course in results[0].courses] == ["01:198:111", "01:640:151"]
+
+
+def test_concurrent_refreshes_share_one_fetch(fetcher, soc_server):
+    fetcher.get_snapshot("2025", "9", "NB")
+    soc_server.requests = 0
+
+    _run_together(20, lambda: fetcher.update_courses("2025", "9", "NB"))
+
+    assert soc_server.requests == 1
+
+
+def test_load_error_is_shared(fetcher, soc_server):
+    soc_server.status = 503
+
+    results = _run_together(10, lambda: fetcher.get_snapshot("2025", "9", "NB"))
+
+    assert soc_server.requests == 1
+    assert all(isinstance(result, requests.exceptions.HTTPError) for result in results)
+    assert "2025_9_NB" not in fetcher.courses_by_params
+
+
+def test_waiter_times_out_while_load_continues(fetcher, soc_server):
+    soc_server.delay = 1.0
+    fetcher.LOAD_WAIT_TIMEOUT = 0.2
+    leader = threading.Thread(target=fetcher.get_snapshot, args=("2025", "9", "NB"))
+    leader.start()
+    deadline = time.monotonic() + 5
+    while not fetcher._loads.in_flight("2025_9_NB"):
+        assert time.monotonic() < deadline, "load never started"
+        time.sleep(0.01)
+
+    with pytest.raises(FutureTimeoutError):
+        fetcher.get_snapshot("2025", "9", "NB")
+
+    # The load itself is unaffected and installs the snapshot for everyone
+    leader.join()
+    assert soc_server.requests == 1
+    assert len(fetcher.courses_by_params["2025_9_NB"]) == 2